@@ -5,8 +5,10 @@ This module provides functions to load and search ticket embeddings
 generated by the generate_ticket_embeddings.py utility script.
 """
 
+import hashlib
 import json
-import math
+import threading
+import numpy as np
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
@@ -16,7 +18,7 @@ class TicketEmbedding:
     """Represents a ticket embedding with metadata"""
     ticket_id: str
     content_hash: str
-    embedding: List[float]
+    embedding: List[float]  # A row of the .npy matrix for files that store vectors separately
     content_preview: str
     generated_at: str
     token_count: int
@@ -39,12 +41,18 @@ class EmbeddingManager:
         Initialize the embedding manager
         
         Args:
-            embeddings_file: Path to the embeddings JSON file
+            embeddings_file: Path to the embeddings JSON file (vectors may live in a sibling .npy file)
         """
         self.embeddings_file = Path(embeddings_file)
         self.embeddings: Dict[str, TicketEmbedding] = {}
         self.metadata: Dict[str, Any] = {}
+        
+        # Similarity search bank: row i is the unit-normalized embedding of bank_ids[i]
+        self.bank_ids: List[str] = []
+        self.bank = np.empty((0, 0), dtype=np.float32)
+        
         self._load_embeddings()
+        self._build_similarity_bank()
     
     def _load_embeddings(self) -> None:
         """Load embeddings from file"""
@@ -59,12 +67,20 @@ class EmbeddingManager:
             
             self.metadata = data.get("metadata", {})
             
+            # Newer files keep the vectors in a sibling .npy matrix (row i = embeddings[i],
+            # unit-normalized float16, upcast to float32 for the similarity bank);
+            # older ones store each vector inline
+            records = data.get("embeddings", [])
+            vectors = None
+            if self.metadata.get("vectors_file"):
+                vectors = load_vectors_file(self.embeddings_file, self.metadata, len(records))
+            
             # Load embeddings into dataclass objects
-            for embedding_data in data.get("embeddings", []):
+            for row, embedding_data in enumerate(records):
                 ticket_embedding = TicketEmbedding(
                     ticket_id=embedding_data["ticket_id"],
                     content_hash=embedding_data["content_hash"],
-                    embedding=embedding_data["embedding"],
+                    embedding=vectors[row] if vectors is not None else embedding_data["embedding"],
                     content_preview=embedding_data["content_preview"],
                     generated_at=embedding_data["generated_at"],
                     token_count=embedding_data["token_count"]
@@ -73,6 +89,22 @@ class EmbeddingManager:
                 
         except Exception as e:
             print(f"❌ Error loading embeddings: {e}")
+            print("   Run 'python generate_ticket_embeddings.py' to regenerate embeddings")
+    
+    def _build_similarity_bank(self) -> None:
+        """Stack all loaded embeddings into one row-normalized (N, D) float32 matrix"""
+        if not self.embeddings:
+            return
+        
+        self.bank_ids = list(self.embeddings.keys())
+        bank = np.array(
+            [self.embeddings[ticket_id].embedding for ticket_id in self.bank_ids],
+            dtype=np.float32
+        )
+        
+        norms = np.linalg.norm(bank, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0  # Zero vectors keep a similarity of 0
+        self.bank = bank / norms
     
     def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """
@@ -85,21 +117,21 @@ class EmbeddingManager:
         Returns:
             Similarity score between -1 and 1 (1 = identical, 0 = orthogonal, -1 = opposite)
         """
-        if len(vec1) != len(vec2):
-            raise ValueError(f"Vector dimensions don't match: {len(vec1)} vs {len(vec2)}")
+        a = np.asarray(vec1, dtype=np.float64)
+        b = np.asarray(vec2, dtype=np.float64)
         
-        # Calculate dot product
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
+        if a.shape != b.shape:
+            raise ValueError(f"Vector dimensions don't match: {len(vec1)} vs {len(vec2)}")
         
         # Calculate magnitudes
-        magnitude1 = math.sqrt(sum(a * a for a in vec1))
-        magnitude2 = math.sqrt(sum(a * a for a in vec2))
+        magnitude1 = np.linalg.norm(a)
+        magnitude2 = np.linalg.norm(b)
         
         # Avoid division by zero
         if magnitude1 == 0 or magnitude2 == 0:
             return 0.0
         
-        return dot_product / (magnitude1 * magnitude2)
+        return float(np.dot(a, b) / (magnitude1 * magnitude2))
     
     def find_similar_tickets(
         self, 
@@ -118,24 +150,34 @@ class EmbeddingManager:
         Returns:
             List of similarity results, sorted by similarity (highest first)
         """
-        if not self.embeddings:
+        if not self.embeddings or top_k <= 0:
             return []
         
-        similarities = []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape != (self.bank.shape[1],):
+            raise ValueError(f"Vector dimensions don't match: {len(query_embedding)} vs {self.bank.shape[1]}")
         
-        for ticket_id, ticket_embedding in self.embeddings.items():
-            similarity = self.cosine_similarity(query_embedding, ticket_embedding.embedding)
-            
-            if similarity >= min_similarity:
-                similarities.append(SimilarityResult(
-                    ticket_id=ticket_id,
-                    similarity=similarity,
-                    content_preview=ticket_embedding.content_preview
-                ))
-        
-        # Sort by similarity (highest first) and return top_k
-        similarities.sort(key=lambda x: x.similarity, reverse=True)
-        return similarities[:top_k]
+        # Bank rows are unit length, so one matrix-vector product yields all cosine similarities
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            scores = np.zeros(len(self.bank_ids), dtype=np.float32)
+        else:
+            scores = self.bank @ (query / query_norm)
+        
+        # Select the top_k candidates without sorting the whole bank
+        k = min(top_k, len(scores))
+        top_indices = np.argpartition(-scores, k - 1)[:k]
+        top_indices = top_indices[np.argsort(-scores[top_indices])]
+        
+        return [
+            SimilarityResult(
+                ticket_id=self.bank_ids[i],
+                similarity=float(scores[i]),
+                content_preview=self.embeddings[self.bank_ids[i]].content_preview
+            )
+            for i in top_indices
+            if scores[i] >= min_similarity
+        ]
     
     def find_similar_to_ticket(
         self, 
@@ -221,6 +263,53 @@ def find_similar_tickets(
     manager = EmbeddingManager(embeddings_file)
     return manager.find_similar_tickets(query_embedding, top_k)
 
+def vectors_file_digest(vectors_file: Path) -> str:
+    """BLAKE2b (256-bit) digest of a .npy vectors file, recorded in the JSON metadata"""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(vectors_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_vectors_file(
+    embeddings_file: Path,
+    metadata: Dict[str, Any],
+    record_count: int,
+    mmap_mode: Optional[str] = None
+) -> np.ndarray:
+    """
+    Load the .npy matrix named in an embeddings file's metadata, checking it belongs to it
+    
+    The JSON and .npy files are replaced one after the other, so an interrupted
+    save can leave a new matrix next to old records (or the reverse). Row i must
+    belong to record i, so a matrix whose digest or row count doesn't match the
+    metadata is rejected rather than attached to the wrong tickets.
+    
+    Args:
+        embeddings_file: Path to the embeddings JSON file
+        metadata: Its metadata, naming the vectors file
+        record_count: Number of records in the JSON file
+        mmap_mode: Passed to np.load
+        
+    Returns:
+        The (record_count, dimension) matrix
+        
+    Raises:
+        ValueError: The matrix doesn't match the JSON file
+    """
+    vectors_file = embeddings_file.parent / metadata["vectors_file"]
+    expected_digest = metadata.get("vectors_digest")
+    if expected_digest is not None and vectors_file_digest(vectors_file) != expected_digest:
+        raise ValueError(f"{vectors_file} does not match {embeddings_file} (digest differs)")
+    
+    vectors = np.load(vectors_file, mmap_mode=mmap_mode)
+    expected_rows = metadata.get("vector_rows", record_count)
+    if vectors.shape[0] != expected_rows or expected_rows != record_count:
+        raise ValueError(
+            f"{vectors_file} has {vectors.shape[0]} rows, {embeddings_file} has {record_count} records"
+        )
+    return vectors
+
 class TicketEmbeddingSystem:
     """High-level ticket embedding system for research agents"""
     
@@ -228,6 +317,10 @@ class TicketEmbeddingSystem:
         """Initialize the ticket embedding system"""
         self.embedding_manager = EmbeddingManager()
         self.embeddings_cache = {}  # For compatibility with research agents
+        # Query embeddings keyed by content hash: manual tickets all share the id "MANUAL",
+        # and one instance serves every session, so ticket ids can't be used as keys here
+        self._query_embeddings = {}
+        self._query_lock = threading.Lock()
         
         # Load existing embeddings into cache
         self._load_embeddings_to_cache()
@@ -247,120 +340,114 @@ class TicketEmbeddingSystem:
             
         Returns:
             TicketSimilarityResult object
+            
+        Raises:
+            Exception: Generating the query embedding failed
         """
         from app.core.research_models import TicketSimilarityResult, SimilarTicket
         
-        try:
-            # Generate embedding for query ticket if needed
-            query_embedding = self._get_or_generate_embedding(query_ticket)
+        # Generate embedding for query ticket if needed
+        query_embedding = self._get_or_generate_embedding(query_ticket)
+        
+        # Find similar tickets using embedding manager with optimized threshold
+        similar_results = self.embedding_manager.find_similar_tickets(
+            query_embedding, top_k=3, min_similarity=0.60  # Raised minimum threshold
+        )
+        
+        # Filter to only include historical tickets that exist in our dataset
+        historical_ticket_ids = {t.ticket_id for t in historical_tickets}
+        filtered_results = [r for r in similar_results if r.ticket_id in historical_ticket_ids]
+        
+        # Further filter for high similarity (75%+) for "high similarity detection"
+        high_similarity_results = [r for r in filtered_results if r.similarity >= 0.75]
+        
+        if high_similarity_results:
+            # Convert to SimilarTicket objects with German key learnings
+            similar_tickets = []
+            for result in high_similarity_results:
+                # Find the actual ticket object
+                historical_ticket = next((t for t in historical_tickets if t.ticket_id == result.ticket_id), None)
+                
+                if historical_ticket:
+                    # Generate German key learnings from resolution
+                    key_learnings = self._generate_german_key_learnings(historical_ticket)
+                    
+                    similar_ticket = SimilarTicket(
+                        ticket_id=result.ticket_id,
+                        title=historical_ticket.title,
+                        similarity_score=result.similarity,
+                        resolution_summary=getattr(historical_ticket, 'resolution', 'Lösung nicht verfügbar')[:200],
+                        key_learnings=key_learnings
+                    )
+                    similar_tickets.append(similar_ticket)
             
-            # Find similar tickets using embedding manager with optimized threshold
-            similar_results = self.embedding_manager.find_similar_tickets(
-                query_embedding, top_k=3, min_similarity=0.60  # Raised minimum threshold
+            return TicketSimilarityResult(
+                similar_tickets_found=True,
+                similar_tickets=similar_tickets,
+                similarity_threshold_used=0.75,
+                search_summary=f"Gefunden: {len(similar_tickets)} ähnliche Tickets mit Ähnlichkeit ≥75%"
             )
-            
-            # Filter to only include historical tickets that exist in our dataset
-            historical_ticket_ids = {t.ticket_id for t in historical_tickets}
-            filtered_results = [r for r in similar_results if r.ticket_id in historical_ticket_ids]
-            
-            # Further filter for high similarity (75%+) for "high similarity detection"
-            high_similarity_results = [r for r in filtered_results if r.similarity >= 0.75]
-            
-            if high_similarity_results:
-                # Convert to SimilarTicket objects with German key learnings
-                similar_tickets = []
-                for result in high_similarity_results:
-                    # Find the actual ticket object
-                    historical_ticket = next((t for t in historical_tickets if t.ticket_id == result.ticket_id), None)
-                    
-                    if historical_ticket:
-                        # Generate German key learnings from resolution
-                        key_learnings = self._generate_german_key_learnings(historical_ticket)
-                        
-                        similar_ticket = SimilarTicket(
-                            ticket_id=result.ticket_id,
-                            title=historical_ticket.title,
-                            similarity_score=result.similarity,
-                            resolution_summary=getattr(historical_ticket, 'resolution', 'Lösung nicht verfügbar')[:200],
-                            key_learnings=key_learnings
-                        )
-                        similar_tickets.append(similar_ticket)
+        
+        # Check for medium similarity (60-74%) if no high similarity found
+        elif filtered_results:
+            similar_tickets = []
+            for result in filtered_results:
+                historical_ticket = next((t for t in historical_tickets if t.ticket_id == result.ticket_id), None)
                 
-                return TicketSimilarityResult(
-                    similar_tickets_found=True,
-                    similar_tickets=similar_tickets,
-                    similarity_threshold_used=0.75,
-                    search_summary=f"Gefunden: {len(similar_tickets)} ähnliche Tickets mit Ähnlichkeit ≥75%"
-                )
-            
-            # Check for medium similarity (60-74%) if no high similarity found
-            elif filtered_results:
-                similar_tickets = []
-                for result in filtered_results:
-                    historical_ticket = next((t for t in historical_tickets if t.ticket_id == result.ticket_id), None)
+                if historical_ticket:
+                    key_learnings = self._generate_german_key_learnings(historical_ticket)
                     
-                    if historical_ticket:
-                        key_learnings = self._generate_german_key_learnings(historical_ticket)
-                        
-                        similar_ticket = SimilarTicket(
-                            ticket_id=result.ticket_id,
-                            title=historical_ticket.title,
-                            similarity_score=result.similarity,
-                            resolution_summary=getattr(historical_ticket, 'resolution', 'Lösung nicht verfügbar')[:200],
-                            key_learnings=key_learnings
-                        )
-                        similar_tickets.append(similar_ticket)
-                
-                return TicketSimilarityResult(
-                    similar_tickets_found=True,
-                    similar_tickets=similar_tickets,
-                    similarity_threshold_used=0.60,
-                    search_summary=f"Gefunden: {len(similar_tickets)} verwandte Tickets mit mittlerer Ähnlichkeit (60-74%)"
-                )
-            else:
-                return TicketSimilarityResult(
-                    similar_tickets_found=False,
-                    similar_tickets=[],
-                    similarity_threshold_used=0.75,
-                    search_summary="Keine ähnlichen Tickets über der Schwelle gefunden"
-                )
-                
-        except Exception as e:
+                    similar_ticket = SimilarTicket(
+                        ticket_id=result.ticket_id,
+                        title=historical_ticket.title,
+                        similarity_score=result.similarity,
+                        resolution_summary=getattr(historical_ticket, 'resolution', 'Lösung nicht verfügbar')[:200],
+                        key_learnings=key_learnings
+                    )
+                    similar_tickets.append(similar_ticket)
+            
+            return TicketSimilarityResult(
+                similar_tickets_found=True,
+                similar_tickets=similar_tickets,
+                similarity_threshold_used=0.60,
+                search_summary=f"Gefunden: {len(similar_tickets)} verwandte Tickets mit mittlerer Ähnlichkeit (60-74%)"
+            )
+        else:
             return TicketSimilarityResult(
                 similar_tickets_found=False,
                 similar_tickets=[],
                 similarity_threshold_used=0.75,
-                search_summary=f"Fehler bei der Ähnlichkeitssuche: {str(e)}"
+                search_summary="Keine ähnlichen Tickets über der Schwelle gefunden"
             )
     
     def _get_or_generate_embedding(self, ticket):
         """Get or generate embedding for a ticket"""
-        # First check if we already have an embedding
+        # Saved tickets reuse the embedding loaded from the embeddings file
         if ticket.ticket_id in self.embeddings_cache:
             return self.embeddings_cache[ticket.ticket_id]
         
-        # Generate new embedding using LLM client
-        try:
-            from app.core.llm_client import LLMClient
-            client = LLMClient()
-            
-            # Create content for embedding (same strategy as generate_ticket_embeddings.py)
-            content = f"Title: {ticket.title}\n\nBody: {ticket.body}"
-            if hasattr(ticket, 'resolution') and ticket.resolution:
-                content += f"\n\nResolution: {ticket.resolution}"
-            
-            # Generate embedding
-            embedding = client.get_embedding(content)
-            
-            # Cache the result
-            self.embeddings_cache[ticket.ticket_id] = embedding
-            
-            return embedding
-            
-        except Exception as e:
-            print(f"Error generating embedding for ticket {ticket.ticket_id}: {e}")
-            # Return a dummy embedding vector of correct size
-            return [0.0] * 1536
+        # Create content for embedding (same strategy as generate_ticket_embeddings.py)
+        content = f"Title: {ticket.title}\n\nBody: {ticket.body}"
+        if hasattr(ticket, 'resolution') and ticket.resolution:
+            content += f"\n\nResolution: {ticket.resolution}"
+        content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=32).hexdigest()
+        
+        with self._query_lock:
+            cached = self._query_embeddings.get(content_hash)
+        if cached is not None:
+            return cached
+        
+        # Generate new embedding using LLM client; API errors propagate instead of
+        # returning a placeholder vector that would be searched (and cached) as real
+        from app.core.llm_client import LLMClient
+        client = LLMClient()
+        embedding = client.get_embeddings_batch([content], raise_on_error=True)[0]
+        
+        # Cache the result
+        with self._query_lock:
+            self._query_embeddings[content_hash] = embedding
+        
+        return embedding
     
     def _generate_german_key_learnings(self, historical_ticket):
         """Generate German key learnings from historical ticket resolution"""
@@ -2,7 +2,7 @@
 Fuzzy search for customer identification
 """
 
-from fuzzywuzzy import fuzz, process
+from rapidfuzz import fuzz, utils
 from typing import List, Dict, Any, Optional, Tuple
 from app.core.models import Customer
 from app.core.research_models import CustomerMatchResult
@@ -47,7 +47,7 @@ class CustomerFuzzySearch:
         # Try contact-based matching if available
         if contact_email:
             email_match = self._find_email_match(contact_email, company_name)
-            if email_match and email_match.confidence_score > fuzzy_match.confidence_score:
+            if email_match and (not fuzzy_match or email_match.confidence_score > fuzzy_match.confidence_score):
                 return email_match
         
         # Return best fuzzy match or no match
@@ -116,7 +116,8 @@ class CustomerFuzzySearch:
         # Calculate scores using different algorithms
         ratio_score = fuzz.ratio(core_name1.lower(), core_name2.lower())
         partial_score = fuzz.partial_ratio(core_name1.lower(), core_name2.lower())
-        token_score = fuzz.token_sort_ratio(core_name1.lower(), core_name2.lower())
+        # Strip punctuation before tokenizing, as fuzzywuzzy's token_sort_ratio did
+        token_score = fuzz.token_sort_ratio(core_name1.lower(), core_name2.lower(), processor=utils.default_process)
         
         # Convert to 0-1 scale
         scores = [ratio_score / 100.0, partial_score / 100.0, token_score / 100.0]
@@ -262,7 +263,7 @@ class CustomerFuzzySearch:
                             customer_id=customer.id,
                             customer_name=customer.name,
                             confidence_score=confidence,
-                            match_reason=f"E-Mail-Domain-Übereinstimmung mit Firmenname-Ähnlichkeit ({name_similarity}%)",
+                            match_reason=f"E-Mail-Domain-Übereinstimmung mit Firmenname-Ähnlichkeit ({name_similarity:.0f}%)",
                             relevant_data=self._extract_customer_data(customer)
                         )
         
@@ -7,7 +7,7 @@ import os
 import json
 import random
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from dotenv import load_dotenv
 
 # Load environment variables from project root (override system env vars)
@@ -16,14 +16,17 @@ load_dotenv(Path(__file__).parent.parent.parent / '.env', override=True)
 class LLMClient:
     """Multi-provider LLM client wrapper for research tasks"""
     
-    def __init__(self, provider: str = "openai"):
+    def __init__(self, provider: str = "openai", max_connections: Optional[int] = None):
         """
         Initialize LLM client with specified provider
         
         Args:
             provider: "openai" (default) or "anthropic"
+            max_connections: Size of the OpenAI client's keep-alive connection pool,
+                for callers that share this client across threads (SDK default if None)
         """
         self.provider = provider
+        self.max_connections = max_connections
         self.anthropic_client = None
         self.openai_client = None
         
@@ -74,6 +77,17 @@ class LLMClient:
                     client_params["organization"] = clean_org
                 if clean_project:
                     client_params["project"] = clean_project
+                if self.max_connections:
+                    # DefaultHttpxClient keeps the SDK's timeouts (a bare HTTP client would
+                    # fall back to a 5 s read timeout); the Limits class is taken from the
+                    # SDK's own defaults, so it matches whichever HTTP library the SDK uses
+                    from openai import DefaultHttpxClient, DEFAULT_CONNECTION_LIMITS
+                    client_params["http_client"] = DefaultHttpxClient(
+                        limits=type(DEFAULT_CONNECTION_LIMITS)(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_connections
+                        )
+                    )
                 
                 self.openai_client = OpenAI(**client_params)
                 print(f"✅ OpenAI client initialized")
@@ -144,6 +158,68 @@ class LLMClient:
         # Fallback
         return self._fallback_structured(messages, response_format, model)
     
+    def stream_structured_completion(self, messages: List[Dict[str, str]], model: str = None) -> Iterator[str]:
+        """
+        Stream a JSON completion from configured provider as text chunks
+        
+        Parse the joined chunks with parse_json_response(). If streaming is not
+        available or fails before the first chunk, the non-streamed structured
+        completion is yielded as a single chunk instead.
+        
+        Args:
+            messages: List of message dicts
+            model: Specific model name (uses default if None)
+            
+        Yields:
+            Response text chunks as they arrive
+        """
+        if model is None:
+            model = self.mini_model
+        
+        stream = None
+        if self.provider == "anthropic" and self.anthropic_client:
+            stream = self._anthropic_structured_stream(messages, model)
+        elif self.provider == "openai" and self.openai_client:
+            stream = self._openai_structured_stream(messages, model)
+        
+        if stream is not None:
+            streamed_any = False
+            try:
+                for chunk in stream:
+                    streamed_any = True
+                    yield chunk
+                return
+            except Exception as e:
+                if streamed_any:
+                    raise
+                print(f"⚠️  Streaming failed, using non-streamed completion: {e}")
+        
+        yield json.dumps(self.structured_completion(messages, {}, model=model), ensure_ascii=False)
+    
+    @staticmethod
+    def parse_json_response(response_text: str) -> Dict[str, Any]:
+        """
+        Parse a JSON response, tolerating surrounding markdown code fences
+        
+        Args:
+            response_text: Raw response text from the model
+            
+        Returns:
+            Parsed JSON, or an error structure if parsing fails
+        """
+        cleaned_response = response_text.strip()
+        if cleaned_response.startswith('```json'):
+            cleaned_response = cleaned_response.replace('```json', '').replace('```', '').strip()
+        elif cleaned_response.startswith('```'):
+            cleaned_response = cleaned_response.replace('```', '').strip()
+        
+        try:
+            return json.loads(cleaned_response)
+        except json.JSONDecodeError as e:
+            print(f"⚠️  JSON parsing failed, raw response: {cleaned_response[:200]}...")
+            # Return a basic structure as fallback
+            return {"error": "JSON parsing failed", "raw_response": cleaned_response}
+    
     def get_embedding(self, text: str) -> List[float]:
         """
         Get text embedding from OpenAI
@@ -175,12 +251,14 @@ class LLMClient:
             random.seed(text_hash)
             return [random.uniform(-1, 1) for _ in range(1536)]
     
-    def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+    def get_embeddings_batch(self, texts: List[str], raise_on_error: bool = False) -> List[List[float]]:
         """
         Get embeddings for multiple texts from OpenAI
         
         Args:
             texts: List of input texts
+            raise_on_error: Re-raise a failed batch request instead of falling
+                back to individual requests (lets callers retry the batch)
             
         Returns:
             List of embedding vectors
@@ -197,6 +275,8 @@ class LLMClient:
             return [data.embedding for data in response.data]
             
         except Exception as e:
+            if raise_on_error:
+                raise
             print(f"⚠️  OpenAI batch embeddings failed: {e}")
             # Fallback to individual requests
             return [self.get_embedding(text) for text in texts]
@@ -240,6 +320,39 @@ class LLMClient:
     
     def _anthropic_structured(self, messages: List[Dict[str, str]], model: str) -> Dict[str, Any]:
         """Anthropic structured JSON completion"""
+        structured_messages = self._prepare_anthropic_structured_messages(messages)
+        response_text = self._anthropic_chat(structured_messages, model, 0.1)
+        
+        # Clean response and parse JSON
+        return self.parse_json_response(response_text)
+    
+    def _anthropic_structured_stream(self, messages: List[Dict[str, str]], model: str) -> Iterator[str]:
+        """Anthropic structured JSON completion, streamed as text chunks"""
+        structured_messages = self._prepare_anthropic_structured_messages(messages)
+        
+        system_content = None
+        filtered_messages = []
+        for msg in structured_messages:
+            if msg["role"] == "system":
+                system_content = msg["content"]
+            else:
+                filtered_messages.append(msg)
+        
+        request_params = {
+            "model": model,
+            "max_tokens": 2000,
+            "temperature": 0.1,
+            "messages": filtered_messages
+        }
+        if system_content:
+            request_params["system"] = system_content
+        
+        with self.anthropic_client.messages.stream(**request_params) as stream:
+            for text in stream.text_stream:
+                yield text
+    
+    def _prepare_anthropic_structured_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Add JSON-only instructions to messages for Anthropic structured completions"""
         # Handle system messages properly for Anthropic
         system_content = None
         user_messages = []
@@ -267,21 +380,7 @@ class LLMClient:
             combined_system = system_content + "\n\nAlways respond with valid JSON format only."
             structured_messages = [{"role": "system", "content": combined_system}] + structured_messages
         
-        response_text = self._anthropic_chat(structured_messages, model, 0.1)
-        
-        # Clean response and parse JSON
-        cleaned_response = response_text.strip()
-        if cleaned_response.startswith('```json'):
-            cleaned_response = cleaned_response.replace('```json', '').replace('```', '').strip()
-        elif cleaned_response.startswith('```'):
-            cleaned_response = cleaned_response.replace('```', '').strip()
-        
-        try:
-            return json.loads(cleaned_response)
-        except json.JSONDecodeError as e:
-            print(f"⚠️  JSON parsing failed, raw response: {cleaned_response[:200]}...")
-            # Return a basic structure as fallback
-            return {"error": "JSON parsing failed", "raw_response": cleaned_response}
+        return structured_messages
     
     def _openai_structured(self, messages: List[Dict[str, str]], response_format: Dict[str, Any], model: str) -> Dict[str, Any]:
         """OpenAI structured JSON completion"""
@@ -295,6 +394,21 @@ class LLMClient:
         
         return json.loads(response.choices[0].message.content)
     
+    def _openai_structured_stream(self, messages: List[Dict[str, str]], model: str) -> Iterator[str]:
+        """OpenAI structured JSON completion, streamed as text chunks"""
+        stream = self.openai_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.1,
+            max_tokens=2000,
+            response_format={"type": "json_object"},
+            stream=True
+        )
+        
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
     def _fallback_chat(self, messages: List[Dict[str, str]], model: str, temperature: float) -> str:
         """Try alternative provider as fallback"""
         
@@ -4,6 +4,7 @@ Using Pydantic for validation and type safety
 """
 
 from datetime import datetime
+from functools import cached_property
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from enum import Enum
@@ -125,6 +126,14 @@ class Ticket(BaseModel):
     resolved_date: Optional[str] = None
     resolution: Optional[str] = None
     summary: Optional[TicketSummary] = None
+    
+    @cached_property
+    def created_date_display(self) -> str:
+        """created_date formatted for display (dd.mm.YYYY HH:MM), parsed once per ticket"""
+        try:
+            return datetime.fromisoformat(self.created_date.replace('Z', '+00:00')).strftime('%d.%m.%Y %H:%M')
+        except ValueError:
+            return self.created_date
 
 
 # Search Models
@@ -3,7 +3,8 @@ Real research agents for the multi-agent system
 """
 
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Iterator, Callable, Tuple
 from app.core.models import Ticket
 from app.core.data import load_all_data
 from app.core.llm_client import LLMClient
@@ -33,29 +34,30 @@ class ResearchOrchestrator:
     
     def conduct_full_research(self, ticket: Ticket) -> FullResearchResult:
         """Conduct complete 4-step research process"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         errors = []
+        step_timings = {}
         
         try:
-            # Step 1: Customer Identification
-            print("Step 1: Customer identification...")
-            customer_result = self._identify_customer(ticket)
-            
-            # Step 2: Manual Search
-            print("Step 2: Manual search...")
-            manual_results = self._search_manuals(ticket)
-            
-            # Step 3: Ticket Similarity Search
-            print("Step 3: Ticket similarity search...")
-            similarity_result = self._find_similar_tickets(ticket)
+            # Steps 1-3: Customer identification, manual search and ticket similarity (concurrent)
+            print("Steps 1-3: Customer identification, manual search, ticket similarity...")
+            customer_result, manual_results, similarity_result = self.run_research_phase(
+                ticket, step_timings=step_timings, errors=errors
+            )
             
             # Step 4: Research Summary Generation
             print("Step 4: Generate research summary...")
-            research_summary = self._generate_research_summary(
-                ticket, customer_result, manual_results, similarity_result
-            )
+            summary_start = time.perf_counter()
+            try:
+                research_summary = self._generate_research_summary(
+                    ticket, customer_result, manual_results, similarity_result
+                )
+            except Exception as e:
+                errors.append(f"Fehler in Recherche-Schritt 'summary': {str(e)}")
+                research_summary = self._create_error_research_summary(e)
+            step_timings['summary'] = time.perf_counter() - summary_start
             
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             
             return FullResearchResult(
                 customer_identification=customer_result,
@@ -63,12 +65,13 @@ class ResearchOrchestrator:
                 ticket_similarity=similarity_result,
                 research_summary=research_summary,
                 processing_time_seconds=processing_time,
+                step_timings=step_timings,
                 errors_encountered=errors
             )
             
         except Exception as e:
             errors.append(f"Research process error: {str(e)}")
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             
             # Return partial results with error
             return FullResearchResult(
@@ -97,89 +100,167 @@ class ResearchOrchestrator:
                 errors_encountered=errors
             )
     
-    def _identify_customer(self, ticket: Ticket) -> CustomerMatchResult:
-        """Step 1: Identify customer using fuzzy search"""
-        try:
-            # Extract customer info from ticket
-            company_name = ticket.customer_id  # Using customer_id as company name for manual tickets
-            contact_email = ticket.created_by if '@' in ticket.created_by else ""
-            
-            # Use fuzzy search to match customer
-            return self.fuzzy_search.find_customer_match(
-                company_name=company_name,
-                contact_email=contact_email
-            )
-            
-        except Exception as e:
+    def run_research_phase(
+        self,
+        ticket: Ticket,
+        on_step_complete: Optional[Callable[[str], None]] = None,
+        step_timings: Optional[Dict[str, float]] = None,
+        errors: Optional[List[str]] = None
+    ) -> Tuple[CustomerMatchResult, List[ManualSearchResult], TicketSimilarityResult]:
+        """Run research steps 1-3 concurrently and return their results
+        
+        The three steps are independent of each other and spend their time
+        waiting on the LLM/embedding APIs, so they share one thread pool (and
+        the LLM client's pooled HTTP connection) instead of running back to back.
+        A step that raises is replaced by its fallback result; the steps don't
+        catch their own errors, so every fallback is reported in errors.
+        
+        Args:
+            ticket: Ticket to research
+            on_step_complete: Called with 'customer', 'manuals' or 'similar' as each step finishes
+            step_timings: If given, filled with the wall time of each step in seconds
+            errors: If given, receives a message for every step that failed
+            
+        Returns:
+            Tuple of (customer_result, manual_results, similarity_result)
+        """
+        step_timings = step_timings if step_timings is not None else {}
+        errors = errors if errors is not None else []
+        step_results = {}
+        
+        def timed(step, func):
+            step_start = time.perf_counter()
+            try:
+                return func(ticket)
+            finally:
+                step_timings[step] = time.perf_counter() - step_start
+        
+        steps = {
+            'customer': self._identify_customer,
+            'manuals': lambda step_ticket: self._search_manuals(step_ticket, errors=errors),
+            'similar': self._find_similar_tickets,
+        }
+        with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+            futures = {executor.submit(timed, step, func): step for step, func in steps.items()}
+            for future in as_completed(futures):
+                step = futures[future]
+                try:
+                    step_results[step] = future.result()
+                except Exception as e:
+                    errors.append(f"Fehler in Recherche-Schritt '{step}': {str(e)}")
+                    step_results[step] = self._fallback_step_result(step)
+                if on_step_complete:
+                    on_step_complete(step)
+        
+        return step_results['customer'], step_results['manuals'], step_results['similar']
+    
+    def _fallback_step_result(self, step: str):
+        """Fallback result for a research step that raised instead of returning"""
+        if step == 'customer':
             return CustomerMatchResult(
                 confidence_score=0.0,
-                match_reason=f"Error during customer identification: {str(e)}"
+                match_reason="Fehler bei der Kundenidentifikation"
             )
+        if step == 'manuals':
+            return []
+        return TicketSimilarityResult(
+            similar_tickets_found=False,
+            similar_tickets=[],
+            search_summary="Fehler bei der Ähnlichkeits-Suche"
+        )
     
-    def _search_manuals(self, ticket: Ticket) -> List[ManualSearchResult]:
-        """Step 2: Search relevant manuals using LLM"""
-        manual_results = []
+    def _identify_customer(self, ticket: Ticket) -> CustomerMatchResult:
+        """Step 1: Identify customer using fuzzy search"""
+        # Extract customer info from ticket
+        company_name = ticket.customer_id  # Using customer_id as company name for manual tickets
+        contact_email = ticket.created_by if '@' in ticket.created_by else ""
         
-        for product_sku in ticket.related_skus:
-            try:
-                # Find manual for this product
-                relevant_manual = None
-                for manual in self.manuals:
-                    if manual.product_sku == product_sku:
-                        relevant_manual = manual
-                        break
-                
-                if not relevant_manual:
-                    manual_results.append(ManualSearchResult(
+        # Use fuzzy search to match customer
+        return self.fuzzy_search.find_customer_match(
+            company_name=company_name,
+            contact_email=contact_email
+        )
+    
+    def _search_manuals(self, ticket: Ticket, errors: Optional[List[str]] = None) -> List[ManualSearchResult]:
+        """Step 2: Search relevant manuals using LLM
+        
+        A product whose search fails gets an error result and a message in
+        errors (if given), so the other products' results are kept.
+        """
+        # A SKU listed twice would only repeat the same LLM call - dedupe, keep order
+        product_skus = list(dict.fromkeys(ticket.related_skus))
+        if not product_skus:
+            return []
+        
+        # One LLM call per product - issue them concurrently, keep SKU order
+        with ThreadPoolExecutor(max_workers=len(product_skus)) as executor:
+            futures = [
+                (product_sku, executor.submit(self._search_manual_for_sku, ticket, product_sku))
+                for product_sku in product_skus
+            ]
+            results = []
+            for product_sku, future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    if errors is not None:
+                        errors.append(f"Fehler bei der Handbuchsuche für {product_sku}: {str(e)}")
+                    results.append(ManualSearchResult(
                         product_sku=product_sku,
                         manual_found=False,
                         relevant_sections=[],
                         overall_confidence=ConfidenceLevel.LOW,
-                        summary=f"No manual found for product {product_sku}"
+                        summary=f"Error searching manual for {product_sku}: {str(e)}"
                     ))
-                    continue
-                
-                # Use LLM to find relevant sections
-                relevant_sections = self._find_relevant_manual_sections(
-                    ticket, relevant_manual
-                )
-                
-                # Determine overall confidence
-                if relevant_sections:
-                    avg_relevance = sum(s.relevance_score for s in relevant_sections) / len(relevant_sections)
-                    if avg_relevance >= 0.8:
-                        confidence = ConfidenceLevel.HIGH
-                    elif avg_relevance >= 0.6:
-                        confidence = ConfidenceLevel.MEDIUM
-                    else:
-                        confidence = ConfidenceLevel.LOW
-                else:
-                    confidence = ConfidenceLevel.LOW
-                
-                manual_results.append(ManualSearchResult(
-                    product_sku=product_sku,
-                    manual_found=True,
-                    relevant_sections=relevant_sections,
-                    overall_confidence=confidence,
-                    summary=self._create_manual_summary(relevant_sections, product_sku)
-                ))
-                
-            except Exception as e:
-                manual_results.append(ManualSearchResult(
-                    product_sku=product_sku,
-                    manual_found=False,
-                    relevant_sections=[],
-                    overall_confidence=ConfidenceLevel.LOW,
-                    summary=f"Error searching manual for {product_sku}: {str(e)}"
-                ))
+            return results
+    
+    def _search_manual_for_sku(self, ticket: Ticket, product_sku: str) -> ManualSearchResult:
+        """Search the manual of a single product for sections relevant to the ticket"""
+        # Find manual for this product
+        relevant_manual = None
+        for manual in self.manuals:
+            if manual.product_sku == product_sku:
+                relevant_manual = manual
+                break
+        
+        if not relevant_manual:
+            return ManualSearchResult(
+                product_sku=product_sku,
+                manual_found=False,
+                relevant_sections=[],
+                overall_confidence=ConfidenceLevel.LOW,
+                summary=f"No manual found for product {product_sku}"
+            )
+        
+        # Use LLM to find relevant sections
+        relevant_sections = self._find_relevant_manual_sections(
+            ticket, relevant_manual
+        )
+        
+        # Determine overall confidence
+        if relevant_sections:
+            avg_relevance = sum(s.relevance_score for s in relevant_sections) / len(relevant_sections)
+            if avg_relevance >= 0.8:
+                confidence = ConfidenceLevel.HIGH
+            elif avg_relevance >= 0.6:
+                confidence = ConfidenceLevel.MEDIUM
+            else:
+                confidence = ConfidenceLevel.LOW
+        else:
+            confidence = ConfidenceLevel.LOW
         
-        return manual_results
+        return ManualSearchResult(
+            product_sku=product_sku,
+            manual_found=True,
+            relevant_sections=relevant_sections,
+            overall_confidence=confidence,
+            summary=self._create_manual_summary(relevant_sections, product_sku)
+        )
     
     def _find_relevant_manual_sections(self, ticket: Ticket, manual) -> List[ManualSection]:
         """Use LLM to find relevant sections in manual"""
-        try:
-            # Create prompt for LLM
-            prompt = f"""
+        # Create prompt for LLM
+        prompt = f"""
 Sie sind ein Technischer Support-Experte, der ein Produkthandbuch analysiert, um für ein Kundenproblem relevante Abschnitte zu finden.
 
 KUNDENPROBLEM:
@@ -214,58 +295,90 @@ RICHTLINIEN:
 - Antworten Sie auf Deutsch in den Textfeldern
 """
 
-            messages = [
-                {"role": "system", "content": "Sie sind ein Experte für technische Handbuch-Analyse. Antworten Sie immer mit gültigem JSON."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response = self.llm_client.structured_completion(messages, {})
-            
-            # Parse response and create ManualSection objects
-            relevant_sections = []
-            
-            if "relevant_sections" in response:
-                for section_data in response["relevant_sections"]:
-                    if section_data.get("relevance_score", 0) >= 0.6:
-                        section = ManualSection(
-                            manual_name=f"{manual.product_sku} Manual",
-                            section_title=section_data.get("section_title", "Unknown Section"),
-                            content_excerpt=section_data.get("content_excerpt", ""),
-                            relevance_score=min(1.0, max(0.0, section_data.get("relevance_score", 0.0))),
-                            relevance_reason=section_data.get("relevance_reason", "")
-                        )
-                        relevant_sections.append(section)
-            
-            return relevant_sections
-            
-        except Exception as e:
-            print(f"Error in manual section analysis: {e}")
-            return []
+        messages = [
+            {"role": "system", "content": "Sie sind ein Experte für technische Handbuch-Analyse. Antworten Sie immer mit gültigem JSON."},
+            {"role": "user", "content": prompt}
+        ]
+        
+        response = self._require_llm_response(self.llm_client.structured_completion(messages, {}))
+        
+        # Parse response and create ManualSection objects
+        relevant_sections = []
+        
+        if "relevant_sections" in response:
+            for section_data in response["relevant_sections"]:
+                if section_data.get("relevance_score", 0) >= 0.6:
+                    content_excerpt = section_data.get("content_excerpt", "")
+                    section = ManualSection(
+                        manual_name=f"{manual.product_sku} Manual",
+                        section_title=section_data.get("section_title", "Unknown Section"),
+                        content_excerpt=content_excerpt,
+                        preview=content_excerpt[:150] + "..." if len(content_excerpt) > 150 else content_excerpt,
+                        relevance_score=min(1.0, max(0.0, section_data.get("relevance_score", 0.0))),
+                        relevance_reason=section_data.get("relevance_reason", "")
+                    )
+                    relevant_sections.append(section)
+        
+        return relevant_sections
     
     def _find_similar_tickets(self, ticket: Ticket) -> TicketSimilarityResult:
         """Step 3: Find similar historical tickets"""
-        try:
-            # Filter to historical (closed) tickets only
-            historical_tickets = [t for t in self.tickets if hasattr(t, 'status') and t.status.value == 'closed']
-            
-            return self.embedding_system.find_similar_tickets(ticket, historical_tickets)
-            
-        except Exception as e:
-            return TicketSimilarityResult(
-                similar_tickets_found=False,
-                similar_tickets=[],
-                search_summary=f"Fehler bei der Ähnlichkeitssuche: {str(e)}"
-            )
+        # Filter to historical (closed) tickets only
+        historical_tickets = [t for t in self.tickets if hasattr(t, 'status') and t.status.value == 'closed']
+        
+        return self.embedding_system.find_similar_tickets(ticket, historical_tickets)
     
     def _generate_research_summary(self, ticket: Ticket, customer_result: CustomerMatchResult, 
                                  manual_results: List[ManualSearchResult], 
                                  similarity_result: TicketSimilarityResult) -> ResearchSummary:
         """Step 4: Generate comprehensive research summary using GPT-4o"""
-        try:
-            # Prepare context for LLM
-            context = self._prepare_research_context(ticket, customer_result, manual_results, similarity_result)
-            
-            prompt = f"""
+        messages = self._build_research_summary_messages(ticket, customer_result, manual_results, similarity_result)
+        
+        # Use GPT-4o (full model) for high-quality synthesis
+        response = self._require_llm_response(
+            self.llm_client.structured_completion(messages, {}, model=self.llm_client.full_model)
+        )
+        
+        # Validate and sanitize LLM response
+        return self._create_validated_research_summary(response, manual_results)
+    
+    def _generate_research_summary_stream(self, ticket: Ticket, customer_result: CustomerMatchResult,
+                                        manual_results: List[ManualSearchResult],
+                                        similarity_result: TicketSimilarityResult) -> Iterator[str]:
+        """
+        Step 4, streamed: yield the raw JSON summary from GPT-4o as it arrives
+        
+        Parse the joined chunks with _parse_research_summary().
+        """
+        messages = self._build_research_summary_messages(ticket, customer_result, manual_results, similarity_result)
+        yield from self.llm_client.stream_structured_completion(messages, model=self.llm_client.full_model)
+    
+    def _parse_research_summary(self, response_text: str, manual_results: List[ManualSearchResult]) -> ResearchSummary:
+        """Create a validated ResearchSummary from the streamed JSON response text"""
+        response = self._require_llm_response(self.llm_client.parse_json_response(response_text))
+        return self._create_validated_research_summary(response, manual_results)
+    
+    @staticmethod
+    def _require_llm_response(response: Any) -> Dict[str, Any]:
+        """Raise if the LLM client returned its error structure instead of a JSON object
+        
+        The client reports exhausted providers and unparseable replies as
+        {"error": ...}; raising lets run_research_phase record the failure.
+        """
+        if not isinstance(response, dict):
+            raise ValueError("Invalid response format from LLM")
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+    
+    def _build_research_summary_messages(self, ticket: Ticket, customer_result: CustomerMatchResult,
+                                       manual_results: List[ManualSearchResult],
+                                       similarity_result: TicketSimilarityResult) -> List[Dict[str, str]]:
+        """Build the LLM messages for the research summary (step 4)"""
+        # Prepare context for LLM
+        context = self._prepare_research_context(ticket, customer_result, manual_results, similarity_result)
+        
+        prompt = f"""
 Sie sind ein Senior-Technischer Support-Analyst, der eine umfassende Recherche-Zusammenfassung für ein Kundenticket erstellt.
 
 {context}
@@ -294,29 +407,26 @@ RICHTLINIEN:
 - WICHTIG: Keine nächsten Schritte oder offenen Fragen - diese werden in der Planungsphase erstellt
 """
 
-            messages = [
-                {"role": "system", "content": "Sie sind ein Senior-Technischer Support-Analyst mit tiefgreifender Expertise in Fehlerbehebung und Kundenservice. Antworten Sie immer mit gültigem JSON."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            # Use GPT-4o (full model) for high-quality synthesis
-            response = self.llm_client.structured_completion(messages, {}, model=self.llm_client.full_model)
-            
-            # Validate and sanitize LLM response
-            return self._create_validated_research_summary(response, manual_results)
-            
-        except Exception as e:
-            return ResearchSummary(
-                customer_status="Error in research summary generation",
-                technical_findings=f"Research summary failed: {str(e)}",
-                historical_context="Unable to generate summary",
-                initial_cause_assessment=None,
-                confidence_assessment=ConfidenceLevel.LOW,
-                confidence_explanation="Systemfehler - Zusammenfassung konnte nicht erstellt werden",
-                urgency_level="medium",
-                urgency_explanation="Standard-Dringlichkeit aufgrund von Systemfehlern",
-                relevant_manuals=[]
-            )
+        messages = [
+            {"role": "system", "content": "Sie sind ein Senior-Technischer Support-Analyst mit tiefgreifender Expertise in Fehlerbehebung und Kundenservice. Antworten Sie immer mit gültigem JSON."},
+            {"role": "user", "content": prompt}
+        ]
+        
+        return messages
+    
+    def _create_error_research_summary(self, error: Exception) -> ResearchSummary:
+        """Fallback research summary when summary generation fails"""
+        return ResearchSummary(
+            customer_status="Error in research summary generation",
+            technical_findings=f"Research summary failed: {str(error)}",
+            historical_context="Unable to generate summary",
+            initial_cause_assessment=None,
+            confidence_assessment=ConfidenceLevel.LOW,
+            confidence_explanation="Systemfehler - Zusammenfassung konnte nicht erstellt werden",
+            urgency_level="medium",
+            urgency_explanation="Standard-Dringlichkeit aufgrund von Systemfehlern",
+            relevant_manuals=[]
+        )
     
     def _prepare_research_context(self, ticket: Ticket, customer_result: CustomerMatchResult,
                                 manual_results: List[ManualSearchResult], 
@@ -26,6 +26,7 @@ class ManualSection(BaseModel):
     content_excerpt: str = Field(..., description="Key excerpt from this section")
     relevance_score: float = Field(..., ge=0.0, le=1.0, description="How relevant this section is")
     relevance_reason: str = Field(..., description="Why this section is relevant to the ticket")
+    preview: str = Field("", description="Truncated excerpt for compact display (set at construction)")
 
 class ManualSearchResult(BaseModel):
     """Result of manual search"""
@@ -69,4 +70,5 @@ class FullResearchResult(BaseModel):
     ticket_similarity: TicketSimilarityResult
     research_summary: ResearchSummary
     processing_time_seconds: Optional[float] = None
+    step_timings: Dict[str, float] = Field(default_factory=dict, description="Wall-clock seconds per research step")
     errors_encountered: List[str] = Field(default_factory=list)
@@ -3,20 +3,15 @@ Interactive ticket closing component with AI-powered workflow
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
 import time
 
-# Add parent directories to path
-sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-
 from app.ui.utils.state import get_workflow_state, advance_to_stage, complete_workflow_reset
 from app.ui.utils.german import get_text
 from app.core.closing_agents import ClosingAgent
 from app.core.closing_models import (
     ClosingNotes, ClosingWorkflowState
 )
-from app.core.data import load_all_data, load_closing_notes
+from app.ui.utils.data_cache import get_closing_notes
 
 
 def render_closing_section():
@@ -167,17 +162,7 @@ def render_closing_notes_input(closing_state: ClosingWorkflowState, selected_tic
     # Load demo closing notes from data file
     demo_closing_notes = {}
     try:
-        if 'demo_data' not in st.session_state:
-            crm_data, tickets, manuals, sops = load_all_data()
-            closing_notes = load_closing_notes()
-            st.session_state.demo_data = {
-                'crm': crm_data,
-                'tickets': tickets,
-                'manuals': manuals,
-                'sops': sops,
-                'closing_notes': closing_notes
-            }
-        demo_closing_notes = st.session_state.demo_data.get('closing_notes', {})
+        demo_closing_notes = get_closing_notes()
     except Exception as e:
         st.warning(f"Fehler beim Laden der Demo-Daten: {e}")
         demo_closing_notes = {}
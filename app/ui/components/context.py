@@ -3,17 +3,12 @@ Context and demo overview component
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
 import pandas as pd
 
-# Add parent directories to path
-sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-
-from app.core.data import load_all_data
 from app.core.models import TicketStatus
 from app.ui.utils.state import advance_to_stage
 from app.ui.utils.german import get_text
+from app.ui.utils.data_cache import load_demo_data
 
 
 def render_context_section():
@@ -66,18 +61,18 @@ def render_company_overview(demo_data):
     
     with col1:
         st.markdown("#### 🔧 " + get_text('products_table'))
-        render_products_table(demo_data['crm'])
+        render_products_table(demo_data.crm)
     
     with col2:
         st.markdown("#### 📖 " + get_text('manual_buttons'))
-        render_manual_buttons(demo_data['manuals'])
+        render_manual_buttons(demo_data.manuals)
     
     # Customer description paragraph
     st.markdown(get_text('customer_description'))
     
     # Customer table with complete data
     st.markdown("#### 👥 " + get_text('customers_table'))
-    render_enhanced_customers_table(demo_data['crm'])
+    render_enhanced_customers_table(demo_data.crm)
 
 
 def render_products_table(crm_data):
@@ -185,7 +180,7 @@ def render_data_exploration(demo_data):
     st.markdown(get_text('ticket_database_description'))
     
     # Full-width historical tickets table
-    render_enhanced_historical_tickets_table(demo_data['tickets'])
+    render_enhanced_historical_tickets_table(demo_data.tickets)
     
     # Communication guidelines section
     st.markdown("#### 📄 " + get_text('communication_guidelines'))
@@ -194,7 +189,7 @@ def render_data_exploration(demo_data):
     st.markdown(get_text('onboarding_guidelines_description'))
     
     # Communication guidelines button
-    render_communication_guidelines_button(demo_data['sops'])
+    render_communication_guidelines_button(demo_data.sops)
 
 
 def render_enhanced_historical_tickets_table(tickets):
@@ -308,9 +303,9 @@ def render_data_summary(demo_data):
     st.markdown("#### 📈 Daten-Übersicht")
     
     # Calculate stats
-    total_tickets = len(demo_data['tickets'])
-    open_tickets = len([t for t in demo_data['tickets'] if t.status == TicketStatus.OPEN])
-    closed_tickets = len([t for t in demo_data['tickets'] if t.status == TicketStatus.CLOSED])
+    total_tickets = len(demo_data.tickets)
+    open_tickets = len([t for t in demo_data.tickets if t.status == TicketStatus.OPEN])
+    closed_tickets = len([t for t in demo_data.tickets if t.status == TicketStatus.CLOSED])
     
     st.metric("Gesamt-Tickets", total_tickets)
     st.metric("Offene Tickets", open_tickets, delta=f"+{open_tickets} für Demo")
@@ -330,23 +325,3 @@ def render_start_demo_button():
         ):
             advance_to_stage('ticket_input')
             st.rerun()
-
-
-def load_demo_data():
-    """Load demo data with error handling"""
-    try:
-        if 'demo_data' not in st.session_state:
-            crm_data, tickets, manuals, sops = load_all_data()
-            from app.core.data import load_closing_notes
-            closing_notes = load_closing_notes()
-            st.session_state.demo_data = {
-                'crm': crm_data,
-                'tickets': tickets,
-                'manuals': manuals,
-                'sops': sops,
-                'closing_notes': closing_notes
-            }
-        return st.session_state.demo_data
-    except Exception as e:
-        st.error(f"Fehler beim Laden der Demo-Daten: {e}")
-        return None
@@ -3,13 +3,9 @@ Interactive execution component with real AI integration
 """
 
 import streamlit as st
-import sys
 from pathlib import Path
 import time
 
-# Add parent directories to path
-sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-
 from app.ui.utils.state import get_workflow_state, advance_to_stage
 from app.ui.utils.german import get_text
 from app.core.execution_agents import ExecutionAgent
@@ -3,13 +3,8 @@ Intelligent planning component with AI-powered plan generation
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
 import time
 
-# Add parent directories to path
-sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-
 from app.ui.utils.state import get_workflow_state, advance_to_stage, update_workflow_state
 from app.ui.utils.german import get_text
 from app.core.planning_agents import PlanningAgent
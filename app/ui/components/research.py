@@ -3,21 +3,73 @@ Research results display component
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
+import concurrent.futures
+import hashlib
+import json
+import queue
 import time
 
-# Add parent directories to path
-sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-
 from app.ui.utils.state import get_workflow_state, advance_to_stage
 from app.ui.utils.german import get_text
+from app.ui.utils.data_cache import get_manual_markdown_by_sku
+from app.core.models import Ticket
 from app.core.research_agents import ResearchOrchestrator
 from app.core.research_models import FullResearchResult
 
 
+# Completion labels for the research steps, in pipeline order
+_STEP_LABELS = {
+    'customer': "✅ Schritt 1: Kundenidentifikation abgeschlossen",
+    'manuals': "✅ Schritt 2: Handbuch-Suche abgeschlossen",
+    'similar': "✅ Schritt 3: Ähnlichkeits-Suche abgeschlossen",
+    'summary': "✅ Schritt 4: Zusammenfassung erstellt",
+}
+# Short step names, used for the per-step timings
+_STEP_NAMES = {
+    'customer': "Kundenidentifikation",
+    'manuals': "Handbuch-Suche",
+    'similar': "Ähnliche Tickets",
+    'summary': "Zusammenfassung",
+}
+
+# Indicator colors for the assessment section
+_CONFIDENCE_COLORS = {"high": "🟢", "medium": "🟡", "low": "🔴"}
+_URGENCY_COLORS = {"low": "🟢", "medium": "🟡", "high": "🟠", "critical": "🔴"}
+
+
+@st.cache_resource(show_spinner="Initialisiere KI-Agenten...")
+def _get_orchestrator():
+    """Build the research orchestrator once per process (LLM clients, CRM data, embeddings)"""
+    return ResearchOrchestrator()
+
+
+def reset_research_agents():
+    """Drop the cached research orchestrator and research results so both are rebuilt on next use"""
+    _get_orchestrator.clear()
+    _run_research.clear()
+
+
+class _DegradedResearchResult(Exception):
+    """
+    Raised by _run_research when a step failed, so the fallback result is not cached
+    
+    st.cache_data does not store results of calls that raise; the uncached
+    caller (_research_or_degraded) unwraps the result and shows it anyway.
+    """
+    
+    def __init__(self, result: FullResearchResult):
+        super().__init__("; ".join(result.errors_encountered))
+        self.result = result
+
+
+@st.fragment
 def render_research_section():
-    """Render the research results section"""
+    """
+    Render the research results section
+    
+    Runs as a fragment: interactions inside it (handbook buttons, expanders)
+    rerun only this section. Stage transitions rerun the whole app.
+    """
     
     workflow_state = get_workflow_state()
     selected_ticket = workflow_state.get('selected_ticket')
@@ -28,110 +80,244 @@ def render_research_section():
         st.error("Kein Ticket ausgewählt")
         return
     
-    # Check if research has been completed
-    if 'research_results' not in st.session_state:
-        # Run research process
-        conduct_research(selected_ticket)
-    else:
-        # Display completed research results
+    # Run research on first visit, otherwise reuse the stored results.
+    # While a run is in flight ('running'), reruns re-attach to it instead
+    # of starting a second pipeline for the same ticket.
+    research_state = st.session_state.setdefault('research_state', 'idle')
+    if research_state == 'done' and 'research_results' in st.session_state:
         research_results = st.session_state.research_results
-        render_research_results(research_results)
-        
-        # Progress to next stage button
-        col1, col2, col3 = st.columns([1, 1, 1])
-        with col2:
-            if st.button(
-                f"📝 {get_text('create_plan')}",
-                type="primary",
-                width='stretch'
-            ):
-                advance_to_stage('planning')
-                st.rerun()
+    else:
+        research_results = conduct_research(selected_ticket)
+        if research_results is None:
+            # Research failed and mock results were rendered instead
+            return
+    
+    # Display completed research results
+    render_research_results(research_results)
+    
+    # Progress to next stage button
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col2:
+        if st.button(
+            f"📝 {get_text('create_plan')}",
+            type="primary",
+            width='stretch'
+        ):
+            advance_to_stage('planning')
+            st.rerun(scope="app")
 
 
 def conduct_research(ticket):
-    """Conduct the 4-step research process with real-time updates"""
-    
-    # Initialize progress tracking
-    progress_container = st.container()
-    status_container = st.container()
-    
-    with progress_container:
-        st.markdown("### 🔄 KI-Recherche läuft...")
-        
-        # Create progress bars for each step
-        step1_progress = st.progress(0.0, text="Schritt 1: Kundenidentifikation...")
-        step2_progress = st.progress(0.0, text="Schritt 2: Handbuch-Suche...")
-        step3_progress = st.progress(0.0, text="Schritt 3: Ähnliche Tickets...")
-        step4_progress = st.progress(0.0, text="Schritt 4: Recherche-Zusammenfassung...")
-        
-        status_text = st.empty()
+    """
+    Conduct the 4-step research process with real-time updates
+    
+    Returns the FullResearchResult (also stored in session state) so the
+    caller can render it in the same script run, or None if research failed
+    and mock results were rendered instead.
+    
+    Progress is shown in a single st.status container and is event-driven:
+    each step writes its line into the container when its result arrives, the
+    label switches to step 4 once steps 1-3 are done, and the summary's raw
+    JSON is streamed into a code block until it is parsed. The pipeline itself
+    runs in a worker thread (see _run_research) and reports step completions
+    and summary tokens through a queue that this script thread drains.
+    
+    The running job is kept in session state (research_job), so a rerun
+    triggered mid-research picks up the same job instead of starting a new one.
+    """
+    
+    # Single status container for the whole run; the placeholder lets us
+    # remove it once the results are rendered in its place
+    progress_placeholder = st.empty()
+    with progress_placeholder.container():
+        status = st.status("🔄 KI-Recherche läuft...", expanded=True)
     
     try:
-        # Initialize research orchestrator
-        with status_container:
-            with st.spinner("Initialisiere KI-Agenten..."):
-                research_orchestrator = ResearchOrchestrator()
-            
-        # Step 1: Customer Identification
-        status_text.text("🔍 Schritt 1: Suche Kunde in CRM-System...")
-        step1_progress.progress(0.5, text="Schritt 1: Fuzzy-Suche läuft...")
+        # Reuse the process-wide research orchestrator (built on first use)
+        with status:
+            research_orchestrator = _get_orchestrator()
         
-        customer_result = research_orchestrator._identify_customer(ticket)
-        step1_progress.progress(1.0, text="✅ Schritt 1: Kundenidentifikation abgeschlossen")
-        time.sleep(0.5)
+        # Steps 1-3 are independent of each other and run concurrently
+        status.update(label="🔍 Schritte 1-3: Kunde, Handbücher und ähnliche Tickets werden parallel recherchiert...")
         
-        # Step 2: Manual Search
-        status_text.text("📖 Schritt 2: Durchsuche technische Handbücher...")
-        step2_progress.progress(0.3, text="Schritt 2: Handbuch-Analyse mit KI...")
+        ticket_payload = ticket.model_dump(mode='json')
+        ticket_key = _ticket_cache_key(ticket_payload)
         
-        manual_results = research_orchestrator._search_manuals(ticket)
-        step2_progress.progress(1.0, text="✅ Schritt 2: Handbuch-Suche abgeschlossen")
-        time.sleep(0.5)
-        
-        # Step 3: Ticket Similarity
-        status_text.text("🎯 Schritt 3: Suche ähnliche Tickets...")
-        step3_progress.progress(0.4, text="Schritt 3: Erstelle Embeddings...")
-        
-        similarity_result = research_orchestrator._find_similar_tickets(ticket)
-        step3_progress.progress(1.0, text="✅ Schritt 3: Ähnlichkeits-Suche abgeschlossen")
-        time.sleep(0.5)
+        job = st.session_state.get('research_job')
+        if (st.session_state.get('research_state') != 'running'
+                or job is None or job['ticket_key'] != ticket_key):
+            # Cache hits return immediately without emitting any events
+            research_events = queue.Queue()
+            job = {
+                'ticket_key': ticket_key,
+                'events': research_events,
+                'completed_steps': [],
+                'future': _get_research_executor().submit(
+                    _research_or_degraded, ticket_key, ticket_payload, research_orchestrator,
+                    lambda kind, value: research_events.put((kind, value))
+                ),
+            }
+            st.session_state.research_job = job
+            st.session_state.research_state = 'running'
+        else:
+            # Re-attached to a run started by an interrupted script run
+            for step in job['completed_steps']:
+                status.write(_STEP_LABELS[step])
         
-        # Step 4: Research Summary
-        status_text.text("📊 Schritt 4: Erstelle Recherche-Zusammenfassung...")
-        step4_progress.progress(0.6, text="Schritt 4: KI-Analyse...")
+        def on_step(step):
+            # One line per step as it actually completes
+            job['completed_steps'].append(step)
+            status.write(_STEP_LABELS[step])
+            
+            if len(job['completed_steps']) == 3:
+                status.update(label="📊 Schritt 4: Erstelle Recherche-Zusammenfassung...")
         
-        research_summary = research_orchestrator._generate_research_summary(
-            ticket, customer_result, manual_results, similarity_result
-        )
-        step4_progress.progress(1.0, text="✅ Schritt 4: Zusammenfassung erstellt")
+        # Step 4 output is the summary's raw JSON; it is shown as a code block while
+        # it arrives and replaced by the rendered ResearchSummary once parsed
+        with status:
+            summary_placeholder = st.empty()
+        streamed_summary = ''
+        for chunk in _drain_research_events(job['future'], job['events'], on_step):
+            streamed_summary += chunk
+            summary_placeholder.code(streamed_summary, language='json', wrap_lines=True)
         
-        # Create full research result
-        research_results = FullResearchResult(
-            customer_identification=customer_result,
-            manual_search=manual_results,
-            ticket_similarity=similarity_result,
-            research_summary=research_summary,
-            processing_time_seconds=time.time(),
-            errors_encountered=[]
-        )
+        research_results = job['future'].result()
         
         # Store results in session state
         st.session_state.research_results = research_results
+        st.session_state.research_state = 'done'
+        st.session_state.pop('research_job', None)
         
-        # Clear progress indicators and show results
-        progress_container.empty()
-        status_container.empty()
+        # Clear progress indicators - the caller renders the results in place
+        status.update(label="✅ Recherche abgeschlossen", state="complete")
+        progress_placeholder.empty()
         
-        st.success("✅ Recherche erfolgreich abgeschlossen!")
-        st.rerun()
+        return research_results
         
     except Exception as e:
+        # Allow a fresh attempt on the next visit
+        st.session_state.research_state = 'idle'
+        st.session_state.pop('research_job', None)
+        
+        # Remove the progress UI so it does not linger above the fallback results
+        progress_placeholder.empty()
         st.error(f"❌ Fehler während der Recherche: {str(e)}")
         st.info("Verwende Fallback-Ergebnisse für Demo-Zwecke")
         
         # Fallback to mock results if real research fails
         render_mock_research_results()
+        return None
+
+
+@st.cache_resource
+def _get_research_executor():
+    """Worker pool that runs research pipelines off the script thread"""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="research")
+
+
+def _drain_research_events(future, research_events, on_step):
+    """
+    Relay events from a running research pipeline on the script thread
+    
+    Yields the summary tokens (raw JSON text) and passes step
+    completions to on_step until the pipeline has finished.
+    """
+    while not (future.done() and research_events.empty()):
+        try:
+            kind, value = research_events.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        
+        if kind == 'token':
+            yield value
+        else:
+            on_step(value)
+
+
+def _research_or_degraded(ticket_key: str, ticket_payload: dict, orchestrator, on_event=None) -> FullResearchResult:
+    """Run the cached research pipeline, returning degraded results without caching them"""
+    try:
+        return _run_research(ticket_key, ticket_payload, orchestrator, on_event)
+    except _DegradedResearchResult as degraded:
+        return degraded.result
+
+
+def _ticket_cache_key(ticket_payload: dict) -> str:
+    """Cache key for a ticket: its ID plus a hash of its content"""
+    # Manually entered tickets all share the ID "MANUAL", so the ID alone is not enough
+    content_hash = hashlib.blake2b(
+        json.dumps(ticket_payload, sort_keys=True, default=str).encode('utf-8'),
+        digest_size=16
+    ).hexdigest()
+    return f"{ticket_payload.get('ticket_id', 'UNKNOWN')}:{content_hash}"
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _run_research(ticket_key: str, _ticket_payload: dict, _orchestrator, _on_event=None) -> FullResearchResult:
+    """
+    Run the 4-step research pipeline for one ticket (cached across sessions)
+    
+    Must not call any Streamlit elements: it runs in a worker thread and
+    cache_data would replay such calls on every cache hit. Progress is
+    reported through the optional _on_event callback instead.
+    
+    Args:
+        ticket_key: Ticket ID plus content hash (see _ticket_cache_key) - the only hashed argument
+        _ticket_payload: JSON-serialized ticket (excluded from hashing, identified by ticket_key)
+        _orchestrator: ResearchOrchestrator to use (excluded from hashing)
+        _on_event: Called as ('step', name) when a step finishes ('customer', 'manuals',
+            'similar', 'summary') and as ('token', text) for each streamed summary chunk
+        
+    Returns:
+        FullResearchResult of a run where every step succeeded
+        
+    Raises:
+        _DegradedResearchResult: A step failed and fell back; carries the
+            fail-soft result (errors in errors_encountered) so it is not cached
+    """
+    start_time = time.perf_counter()
+    ticket = Ticket(**_ticket_payload)
+    on_event = _on_event or (lambda kind, value: None)
+    
+    step_timings = {}
+    errors_encountered = []
+    
+    customer_result, manual_results, similarity_result = _orchestrator.run_research_phase(
+        ticket,
+        on_step_complete=lambda step: on_event('step', step),
+        step_timings=step_timings,
+        errors=errors_encountered
+    )
+    
+    # Step 4 depends on the results of steps 1-3; its output is streamed
+    summary_start = time.perf_counter()
+    try:
+        summary_chunks = []
+        for chunk in _orchestrator._generate_research_summary_stream(
+            ticket, customer_result, manual_results, similarity_result
+        ):
+            summary_chunks.append(chunk)
+            on_event('token', chunk)
+        research_summary = _orchestrator._parse_research_summary(''.join(summary_chunks), manual_results)
+    except Exception as e:
+        errors_encountered.append(f"Fehler in Recherche-Schritt 'summary': {str(e)}")
+        research_summary = _orchestrator._create_error_research_summary(e)
+    step_timings['summary'] = time.perf_counter() - summary_start
+    on_event('step', 'summary')
+    
+    research_result = FullResearchResult(
+        customer_identification=customer_result,
+        manual_search=manual_results,
+        ticket_similarity=similarity_result,
+        research_summary=research_summary,
+        processing_time_seconds=time.perf_counter() - start_time,
+        step_timings=step_timings,
+        errors_encountered=errors_encountered
+    )
+    if errors_encountered:
+        # Transient failures must not be served to every session for the TTL
+        raise _DegradedResearchResult(research_result)
+    return research_result
 
 
 def render_research_results(research_results: FullResearchResult):
@@ -158,7 +344,14 @@ def render_research_results(research_results: FullResearchResult):
     
     # Show processing time and errors if any
     if research_results.processing_time_seconds:
-        st.caption(f"Verarbeitungszeit: {research_results.processing_time_seconds:.1f} Sekunden")
+        caption = f"Verarbeitungszeit: {research_results.processing_time_seconds:.1f} Sekunden"
+        if research_results.step_timings:
+            caption += " (" + " · ".join(
+                f"{name} {research_results.step_timings[step]:.1f} s"
+                for step, name in _STEP_NAMES.items()
+                if step in research_results.step_timings
+            ) + ")"
+        st.caption(caption)
     
     if research_results.errors_encountered:
         with st.expander("⚠️ Warnungen", expanded=False):
@@ -173,22 +366,27 @@ def render_customer_results(customer_result):
     if customer_result.customer_id:
         st.success(get_text('customer_identified'))
         
-        with st.expander("🔍 Details anzeigen", expanded=True):
-            st.markdown(f"**Kunde:** {customer_result.customer_name}")
-            st.markdown(f"**Vertrauen:** {customer_result.confidence_score:.1%}")
-            st.markdown(f"**Grund:** {customer_result.match_reason}")
+        # Build the details as one markdown block - one element instead of one per line
+        details = [
+            f"**Kunde:** {customer_result.customer_name}",
+            f"**Vertrauen:** {customer_result.confidence_score:.1%}",
+            f"**Grund:** {customer_result.match_reason}",
+        ]
+        
+        if customer_result.relevant_data:
+            data = customer_result.relevant_data
+            details.append(f"**Support-Tier:** {data.get('support_tier', 'Unknown')}")
             
-            if customer_result.relevant_data:
-                data = customer_result.relevant_data
-                st.markdown(f"**Support-Tier:** {data.get('support_tier', 'Unknown')}")
-                
-                if 'purchased_products' in data:
-                    products = [p['sku'] for p in data['purchased_products']]
-                    st.markdown(f"**Produkte:** {', '.join(products)}")
-                
-                if 'contact_person' in data:
-                    contact = data['contact_person']
-                    st.markdown(f"**Kontakt:** {contact.get('name', '')} ({contact.get('email', '')})")
+            if 'purchased_products' in data:
+                products = [p['sku'] for p in data['purchased_products']]
+                details.append(f"**Produkte:** {', '.join(products)}")
+            
+            if 'contact_person' in data:
+                contact = data['contact_person']
+                details.append(f"**Kontakt:** {contact.get('name', '')} ({contact.get('email', '')})")
+        
+        with st.expander("🔍 Details anzeigen", expanded=True):
+            st.markdown("\n\n".join(details))
     else:
         st.warning("Kunde nicht identifiziert")
         st.caption(customer_result.match_reason)
@@ -198,20 +396,22 @@ def render_manual_results(manual_results):
     """Render manual search results"""
     st.markdown("### 📖 " + get_text('manuals'))
     
-    total_sections = sum(len(result.relevant_sections) for result in manual_results)
+    # Single pass: keep only manuals with findings and count their sections
+    nonempty_results = [result for result in manual_results if result.relevant_sections]
+    total_sections = sum(len(result.relevant_sections) for result in nonempty_results)
     
     if total_sections > 0:
         st.info(f"{total_sections} {get_text('sections')} gefunden")
         
         with st.expander("📖 Relevante Abschnitte", expanded=True):
-            for manual_result in manual_results:
-                if manual_result.relevant_sections:
-                    st.markdown(f"**{manual_result.product_sku} Manual:**")
-                    for section in manual_result.relevant_sections:
-                        st.markdown(f"**{section.section_title}** ({section.relevance_score:.1%})")
-                        st.markdown(f"> {section.content_excerpt[:150]}...")
-                        st.caption(section.relevance_reason)
-                        st.markdown("---")
+            # One markdown element per manual instead of three elements per section
+            for manual_result in nonempty_results:
+                st.markdown(f"**{manual_result.product_sku} Manual:**\n\n" + "\n\n---\n\n".join(
+                    f"**{section.section_title}** ({section.relevance_score:.1%})\n\n"
+                    f"> {section.preview}\n\n"
+                    f":gray[{section.relevance_reason}]"
+                    for section in manual_result.relevant_sections
+                ) + "\n\n---")
     else:
         st.warning("Keine relevanten Abschnitte gefunden")
         for result in manual_results:
@@ -228,9 +428,11 @@ def render_similarity_results(similarity_result):
         
         for i, similar_ticket in enumerate(similarity_result.similar_tickets):
             with st.expander(f"🗂️ {similar_ticket.ticket_id}: {similar_ticket.title[:30]}...", expanded=i == 0):
-                st.markdown(f"**Ähnlichkeit:** {similar_ticket.similarity_score:.1%}")
-                st.markdown(f"**Lösung:** {similar_ticket.resolution_summary}")
-                st.markdown(f"**Erkenntnisse:** {similar_ticket.key_learnings}")
+                st.markdown(
+                    f"**Ähnlichkeit:** {similar_ticket.similarity_score:.1%}\n\n"
+                    f"**Lösung:** {similar_ticket.resolution_summary}\n\n"
+                    f"**Erkenntnisse:** {similar_ticket.key_learnings}"
+                )
     else:
         st.info("Keine ähnlichen Tickets gefunden")
         st.caption(similarity_result.search_summary)
@@ -247,21 +449,14 @@ def render_research_summary(research_summary):
     st.markdown("### 📋 Ursprüngliches Ticket")
     with st.expander("🔍 Ticket-Details anzeigen", expanded=False):
         if selected_ticket:
-            # Safe attribute access for Pydantic model
-            ticket_id = getattr(selected_ticket, 'ticket_id', 'Unknown')
-            title = getattr(selected_ticket, 'title', 'No title')
-            body = getattr(selected_ticket, 'body', 'No description')
-            customer_id = getattr(selected_ticket, 'customer_id', 'Unknown')
-            
-            # Handle priority enum safely
-            priority = getattr(selected_ticket, 'priority', None)
-            priority_str = priority.value if priority else 'Unknown'
-            
-            st.markdown(f"**Titel:** {title}")
-            st.markdown(f"**Beschreibung:**")
-            st.markdown(f"> {body}")
-            st.markdown(f"**Priorität:** {priority_str}")
-            st.markdown(f"**Kunde:** {customer_id}")
+            # Ticket is a validated Pydantic model - all displayed fields are required
+            st.markdown(
+                f"**Titel:** {selected_ticket.title}\n\n"
+                f"**Beschreibung:**\n\n"
+                f"> {selected_ticket.body}\n\n"
+                f"**Priorität:** {selected_ticket.priority.value}\n\n"
+                f"**Kunde:** {selected_ticket.customer_id}"
+            )
         else:
             st.warning("Ticket-Kontext nicht verfügbar")
     
@@ -282,17 +477,9 @@ def render_research_summary(research_summary):
     
     with technical_col2:
         # Show handbook button for each product in ticket
-        if selected_ticket and hasattr(selected_ticket, 'related_skus'):
-            # Load complete manuals
-            complete_manuals = get_complete_manuals_for_research()
-            
-            for sku in selected_ticket.related_skus:
-                if st.button(f"📖 Handbuch {sku}", key=f"handbook_{sku}"):
-                    render_complete_handbook_modal(
-                        complete_manuals, 
-                        sku, 
-                        f"{sku} Handbuch"
-                    )
+        if selected_ticket:
+            # Duplicate SKUs would create buttons with the same widget key
+            _render_handbook_buttons(list(dict.fromkeys(selected_ticket.related_skus)))
     
     # Historical context
     st.markdown("**📊 Historischer Kontext:**")
@@ -316,15 +503,10 @@ def render_research_summary(research_summary):
     
     with assess_col1:
         # Confidence assessment with direct explanation display
-        confidence_colors = {
-            "high": "🟢",
-            "medium": "🟡", 
-            "low": "🔴"
-        }
-        confidence_color = confidence_colors.get(research_summary.confidence_assessment.value, "⚪")
+        confidence = research_summary.confidence_assessment.value
         
         st.markdown("**Einschätzungskonfidenz:**")
-        st.markdown(f"{confidence_color} **{research_summary.confidence_assessment.value.title()}**")
+        st.markdown(f"{_CONFIDENCE_COLORS.get(confidence, '⚪')} **{confidence.title()}**")
         
         # Show explanation directly as paragraph
         if hasattr(research_summary, 'confidence_explanation'):
@@ -332,39 +514,30 @@ def render_research_summary(research_summary):
     
     with assess_col2:
         # Urgency assessment with direct explanation display
-        urgency_colors = {
-            "low": "🟢",
-            "medium": "🟡",
-            "high": "🟠", 
-            "critical": "🔴"
-        }
-        urgency_color = urgency_colors.get(research_summary.urgency_level, "⚪")
+        urgency = research_summary.urgency_level
         
         st.markdown("**Dringlichkeit:**")
-        st.markdown(f"{urgency_color} **{research_summary.urgency_level.title()}**")
+        st.markdown(f"{_URGENCY_COLORS.get(urgency, '⚪')} **{urgency.title()}**")
         
         # Show explanation directly as paragraph
         if hasattr(research_summary, 'urgency_explanation'):
             st.markdown(research_summary.urgency_explanation)
 
 
-def get_complete_manuals_for_research():
-    """Load complete manuals - same pattern as context.py"""
-    from app.core.data import load_all_data
-    _, _, manuals, _ = load_all_data()
-    return manuals
+@st.fragment
+def _render_handbook_buttons(skus):
+    """Handbook buttons per product - a click reruns only these buttons and the dialog"""
+    for sku in skus:
+        if st.button(f"📖 Handbuch {sku}", key=f"handbook_{sku}"):
+            render_complete_handbook_modal(sku, f"{sku} Handbuch")
 
 
 @st.dialog("Technisches Handbuch")
-def render_complete_handbook_modal(manuals, product_sku, title):
-    """Render complete handbook content in modal - identical to context.py pattern"""
+def render_complete_handbook_modal(product_sku, title):
+    """Render complete handbook content in modal from the cached SKU index"""
     st.markdown(f"## {title}")
     
-    # Find and display ALL manual content for this product
-    manual_content = ""
-    for manual in manuals:
-        if manual.product_sku == product_sku:
-            manual_content += f"### {manual.title}\n\n{manual.content}\n\n"
+    manual_content = get_manual_markdown_by_sku().get(product_sku)
     
     if manual_content:
         st.markdown(manual_content)
@@ -412,11 +585,49 @@ def _render_single_manual(manual_data):
             st.markdown(f"> {section.get('content', 'No content available')}")
 
 
+# Static content for the mock research fallback
+_MOCK_CUSTOMER_DETAILS = """
+**Kunde:** Acme Maschinenbau GmbH  
+**Vertrauen:** 95%  
+**Produkte:** KW-100 ✅, GW-300 ✅  
+**Support-Historie:** 2 frühere Tickets  
+"""
+
+_MOCK_MANUAL_SECTIONS = """
+**GW-300 Manual - Installation:**
+> Maximale Saughöhe: 1,5m für optimale Leistung
+
+**GW-300 Manual - Troubleshooting:**  
+> Pfeifgeräusch deutet auf Kavitation durch unzureichenden Eingangsdruck hin
+"""
+
+_MOCK_SIMILAR_TICKET = """
+**Vorheriges Ticket:** T-OLD1 (Gelöst)  
+**Problem:** KW-100 Anlaufprobleme  
+**Lösung:** Saughöhe-Anpassung  
+**Relevanz:** 78% (Pumpen-Positionierung)
+"""
+
+_MOCK_SUMMARY = (
+    "**Wahrscheinliche Grundursache identifiziert:** Saughöhe (2m) überschreitet GW-300 "
+    "Spezifikation (1,5m max), verursacht Kavitation und reduzierten Ausgangsdruck. "
+    "Kunde hat Verlauf ähnlicher Positionierungsprobleme."
+)
+
+_MOCK_OPEN_QUESTIONS = "\n".join(
+    f"{i}. {question}" for i, question in enumerate([
+        "Ist eine Saughöhen-Reduzierung baulich möglich?",
+        "Sollte eine Zulaufpumpe als Alternative vorgeschlagen werden?",
+        "Sind weitere GW-300 Einheiten betroffen?"
+    ], 1)
+)
+
+
 def render_mock_research_results():
     """Render mock research results for UI testing"""
     
     # Progress indicator
-    progress_bar = st.progress(1.0)
+    st.progress(1.0)
     st.success("✅ Recherche abgeschlossen")
     
     # Three column layout for search results
@@ -427,37 +638,21 @@ def render_mock_research_results():
         st.success(get_text('customer_identified'))
         
         with st.expander("🔍 Details anzeigen", expanded=True):
-            st.markdown("""
-            **Kunde:** Acme Maschinenbau GmbH  
-            **Vertrauen:** 95%  
-            **Produkte:** KW-100 ✅, GW-300 ✅  
-            **Support-Historie:** 2 frühere Tickets  
-            """)
+            st.markdown(_MOCK_CUSTOMER_DETAILS)
     
     with col2:
         st.markdown("### 📖 " + get_text('manuals'))
         st.info(f"4 {get_text('sections')} gefunden")
         
         with st.expander("📖 Relevante Abschnitte", expanded=True):
-            st.markdown("""
-            **GW-300 Manual - Installation:**
-            > Maximale Saughöhe: 1,5m für optimale Leistung
-            
-            **GW-300 Manual - Troubleshooting:**  
-            > Pfeifgeräusch deutet auf Kavitation durch unzureichenden Eingangsdruck hin
-            """)
+            st.markdown(_MOCK_MANUAL_SECTIONS)
     
     with col3:
         st.markdown("### 📋 " + get_text('previous_tickets'))
         st.warning(f"1 {get_text('similar')} Ticket")
         
         with st.expander("🗂️ T-OLD1: Ähnliches Problem", expanded=True):
-            st.markdown("""
-            **Vorheriges Ticket:** T-OLD1 (Gelöst)  
-            **Problem:** KW-100 Anlaufprobleme  
-            **Lösung:** Saughöhe-Anpassung  
-            **Relevanz:** 78% (Pumpen-Positionierung)
-            """)
+            st.markdown(_MOCK_SIMILAR_TICKET)
     
     # Research summary
     st.markdown("---")
@@ -465,20 +660,11 @@ def render_mock_research_results():
     
     with summary_col1:
         st.markdown("### 🎯 Recherche-Zusammenfassung")
-        st.success("""
-        **Wahrscheinliche Grundursache identifiziert:** Saughöhe (2m) überschreitet GW-300 Spezifikation (1,5m max), verursacht Kavitation und reduzierten Ausgangsdruck. Kunde hat Verlauf ähnlicher Positionierungsprobleme.
-        """)
+        st.success(_MOCK_SUMMARY)
     
     with summary_col2:
         st.metric("Vertrauen", "87%", delta="Hoch")
     
     # Open questions
     st.markdown("### ❓ " + get_text('open_questions'))
-    questions = [
-        "Ist eine Saughöhen-Reduzierung baulich möglich?",
-        "Sollte eine Zulaufpumpe als Alternative vorgeschlagen werden?",
-        "Sind weitere GW-300 Einheiten betroffen?"
-    ]
-    
-    for i, question in enumerate(questions, 1):
-        st.markdown(f"{i}. {question}")
+    st.markdown(_MOCK_OPEN_QUESTIONS)
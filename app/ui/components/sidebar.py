@@ -3,14 +3,7 @@ Sidebar component for demo configuration and controls
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
 
-# Add parent directories to path
-sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-
-from app.core.data import load_all_data
-from app.core.models import TicketStatus
 from app.ui.utils.state import get_config, update_config, complete_workflow_reset, get_workflow_state
 from app.ui.utils.german import get_text
 
@@ -48,12 +41,6 @@ def render_sidebar():
         render_debug_section()
 
 
-# Obsolete functions removed:
-# - render_ticket_selection() - ticket selection now handled in main workflow
-# - render_ai_configuration() - model/temperature controls no longer needed  
-# - render_minimal_controls() - replaced by integrated reset button
-
-
 def render_debug_section():
     """Render debug information (collapsible)"""
     config = get_config()
@@ -65,26 +52,14 @@ def render_debug_section():
                 'config': config,
                 'session_keys': list(st.session_state.keys())
             })
-
-
-def get_demo_tickets():
-    """Get available demo tickets for selection"""
-    try:
-        if 'demo_data' not in st.session_state:
-            crm_data, tickets, manuals, sops = load_all_data()
-            from app.core.data import load_closing_notes
-            closing_notes = load_closing_notes()
-            st.session_state.demo_data = {
-                'crm': crm_data,
-                'tickets': tickets,
-                'manuals': manuals,
-                'sops': sops,
-                'closing_notes': closing_notes
-            }
-        
-        tickets = st.session_state.demo_data['tickets']
-        return [t for t in tickets if t.status == TicketStatus.OPEN]
         
-    except Exception as e:
-        st.sidebar.error(f"Error loading tickets: {e}")
-        return []
+        if st.sidebar.button(
+            "♻️ KI-Agenten neu initialisieren",
+            help="Verwirft die gecachten Research-Agenten und Recherche-Ergebnisse (z.B. nach Änderung der API-Konfiguration)",
+            width='stretch'
+        ):
+            # Imported here so the sidebar does not load the research stage on every page
+            from app.ui.components.research import reset_research_agents
+            reset_research_agents()
+            st.sidebar.success("KI-Agenten werden beim nächsten Recherche-Lauf neu erstellt")
+
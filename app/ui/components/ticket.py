@@ -3,21 +3,51 @@ Ticket input component
 """
 
 import streamlit as st
-import sys
-from pathlib import Path
+import re
 from datetime import datetime
+from typing import NamedTuple
 
-# Add parent directories to path
-sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-
-from app.core.data import load_all_data
 from app.core.models import Ticket, TicketStatus, TicketPriority
 from app.ui.utils.state import get_workflow_state, advance_to_stage, set_selected_ticket
-from app.ui.utils.german import get_text
+from app.ui.utils.german import get_text, get_status_text
+from app.ui.utils.data_cache import load_demo_data, get_open_tickets, get_customers_by_id, get_products_by_sku
+
+
+class ContactInfo(NamedTuple):
+    """Company and contact person of a CRM customer"""
+    company_name: str
+    contact_name: str
+    contact_email: str
+
+
+_NO_CONTACT = ContactInfo("", "", "")
+
+# \Z instead of $ so a trailing newline does not pass validation
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+
+_PRIORITY_OPTIONS = ['low', 'medium', 'high', 'critical']
+
+# Badge and status colour lookups for the ticket display
+_PRIORITY_BADGES = {
+    'low': '🟢 Niedrig',
+    'medium': '🟡 Mittel',
+    'high': '🟠 Hoch',
+    'critical': '🔴 Kritisch'
+}
+_STATUS_COLORS = {
+    'open': '🔴',
+    'in_progress': '🟡',
+    'closed': '🟢'
+}
 
 
+@st.fragment
 def render_ticket_section():
-    """Render the ticket input section"""
+    """Render the ticket input section
+    
+    Runs as a fragment: choosing an example ticket reruns only this section,
+    submitting the form reruns the whole app to enter the research stage.
+    """
     
     st.markdown("## 📋 " + get_text('stage_ticket_input'))
     
@@ -38,24 +68,8 @@ def render_unified_ticket_form():
     # Example ticket selection above the form
     st.markdown("### 🎯 " + get_text('use_example_ticket'))
     
-    # Get open demo tickets
-    open_tickets = [t for t in demo_data['tickets'] if t.status == TicketStatus.OPEN]
-    
-    # Create options
-    example_options = ['-- Eigenes Ticket schreiben --']
-    ticket_map = {}
-    
-    if open_tickets:
-        for ticket in open_tickets:
-            if ticket.ticket_id == "T-EX1":
-                label = get_text('demo_ticket_1')
-            elif ticket.ticket_id == "T-EX2":
-                label = get_text('demo_ticket_2')
-            else:
-                label = f"{ticket.ticket_id}: {ticket.title[:30]}..."
-            
-            example_options.append(label)
-            ticket_map[label] = ticket
+    # Options for the open demo tickets (built once per process)
+    example_options, ticket_map = _build_example_options()
     
     selected_example = st.selectbox(
         "Beispiel auswählen oder eigenes Ticket schreiben",
@@ -69,6 +83,9 @@ def render_unified_ticket_form():
     if selected_example != '-- Eigenes Ticket schreiben --' and selected_example in ticket_map:
         selected_ticket = ticket_map[selected_example]
     
+    # One customer lookup fills company, contact name and email
+    contact = get_contact(selected_ticket.customer_id) if selected_ticket else _NO_CONTACT
+    
     st.markdown("### ✏️ " + get_text('manual_ticket_input'))
     
     with st.form("ticket_form"):
@@ -85,54 +102,35 @@ def render_unified_ticket_form():
             )
             
             # Company name (auto-populated if example selected)
-            company_value = ""
-            if selected_ticket:
-                company_value = get_company_name_from_customer_id(selected_ticket.customer_id, demo_data['crm'])
-            
             company_name = st.text_input(
                 get_text('company_name') + " *",
-                value=company_value,
+                value=contact.company_name,
                 placeholder="z.B. Musterfirma GmbH",
                 help="Name des Unternehmens"
             )
             
             # Contact person name (auto-populated if example selected)
-            contact_name_value = ""
-            if selected_ticket:
-                contact_name_value = get_contact_name_from_customer_id(selected_ticket.customer_id, demo_data['crm'])
-            
             contact_name = st.text_input(
                 get_text('contact_person_name') + " *",
-                value=contact_name_value,
+                value=contact.contact_name,
                 placeholder="z.B. Max Mustermann",
                 help="Name der Kontaktperson"
             )
             
-            # Priority selection (auto-populated if example selected)
-            priority_options = ['medium', 'low', 'high', 'critical']
-            priority_index = 0
-            if selected_ticket:
-                try:
-                    priority_index = priority_options.index(selected_ticket.priority.value)
-                except ValueError:
-                    priority_index = 0
-            
-            priority = st.selectbox(
+            # Priority selection (auto-populated if example selected) - inline
+            # buttons instead of a dropdown for the four fixed options
+            priority = st.segmented_control(
                 get_text('select_priority'),
-                options=priority_options,
+                options=_PRIORITY_OPTIONS,
                 format_func=lambda x: get_text(f'priority_{x}'),
-                index=priority_index
-            )
+                default=selected_ticket.priority.value if selected_ticket else 'medium'
+            ) or 'medium'  # None if the user deselects the active option
         
         with col2:
             # Contact email (auto-populated if example selected)
-            contact_email_value = ""
-            if selected_ticket:
-                contact_email_value = get_contact_email_from_customer_id(selected_ticket.customer_id, demo_data['crm'])
-            
             contact_email = st.text_input(
                 get_text('contact_email') + " *",
-                value=contact_email_value,
+                value=contact.contact_email,
                 placeholder="z.B. max.mustermann@musterfirma.de",
                 help="E-Mail-Adresse der Kontaktperson"
             )
@@ -148,17 +146,14 @@ def render_unified_ticket_form():
             )
             
             # Product selection with "Sonstiges" option (auto-populated if example selected)
-            products = demo_data['crm'].products
-            product_options = [f"{p.sku} - {p.name}" for p in products]
-            product_options.append("Sonstiges")
+            product_options, product_label_by_sku = _build_product_options()
             
             default_products = []
             if selected_ticket:
-                for sku in selected_ticket.related_skus:
-                    for option in product_options:
-                        if option.startswith(sku):
-                            default_products.append(option)
-                            break
+                default_products = [
+                    product_label_by_sku[sku] for sku in selected_ticket.related_skus
+                    if sku in product_label_by_sku
+                ]
             
             selected_products = st.multiselect(
                 get_text('select_products'),
@@ -196,22 +191,59 @@ def render_unified_ticket_form():
                 
                 set_selected_ticket(ticket)
                 advance_to_stage('research')
-                st.rerun()
+                st.rerun(scope="app")
+
+
+@st.cache_resource(show_spinner=False)
+def _build_example_options():
+    """
+    Selectbox labels for the open demo tickets and the ticket behind each label
+    
+    Shared by all sessions - treat the returned list and dict as read-only.
+    
+    Returns:
+        Tuple of (example_options, ticket_map)
+    """
+    example_options = ['-- Eigenes Ticket schreiben --']
+    ticket_map = {}
+    
+    for ticket in get_open_tickets():
+        if ticket.ticket_id == "T-EX1":
+            label = get_text('demo_ticket_1')
+        elif ticket.ticket_id == "T-EX2":
+            label = get_text('demo_ticket_2')
+        else:
+            label = f"{ticket.ticket_id}: {ticket.title[:30]}..."
+        
+        example_options.append(label)
+        ticket_map[label] = ticket
+    
+    return example_options, ticket_map
+
+
+@st.cache_resource(show_spinner=False)
+def _build_product_options():
+    """
+    Multiselect labels for the CRM products plus "Sonstiges"
+    
+    Shared by all sessions - treat the returned list and dict as read-only.
+    
+    Returns:
+        Tuple of (product_options, product_label_by_sku)
+    """
+    product_label_by_sku = {
+        sku: f"{sku} - {product.name}" for sku, product in get_products_by_sku().items()
+    }
+    product_options = list(product_label_by_sku.values()) + ["Sonstiges"]
+    
+    return product_options, product_label_by_sku
 
 
 def render_ticket_display(ticket):
     """Render ticket information display"""
     
     # Get customer information
-    demo_data = st.session_state.get('demo_data', {})
-    crm_data = demo_data.get('crm')
-    customer = None
-    
-    if crm_data:
-        for cust in crm_data.customers:
-            if cust.id == ticket.customer_id:
-                customer = cust
-                break
+    customer = get_customers_by_id().get(ticket.customer_id)
     
     # Main ticket info in columns
     col1, col2 = st.columns([2, 1])
@@ -225,7 +257,7 @@ def render_ticket_display(ticket):
         
         **{get_text('priority')}:** {get_priority_badge(ticket.priority.value)}
         
-        **Erstellt:** {format_datetime(ticket.created_date)}
+        **Erstellt:** {ticket.created_date_display}
         
         **{get_text('description')}:**
         
@@ -234,10 +266,9 @@ def render_ticket_display(ticket):
         
         # Related products
         if ticket.related_skus:
-            st.markdown("**Betroffene Produkte:**")
-            for sku in ticket.related_skus:
-                product_info = get_product_info(sku)
-                st.markdown(f"- **{sku}**: {product_info}")
+            st.markdown("**Betroffene Produkte:**\n\n" + "\n".join(
+                f"- **{sku}**: {get_product_info(sku)}" for sku in ticket.related_skus
+            ))
     
     with col2:
         # Customer context card
@@ -251,11 +282,16 @@ def render_ticket_display(ticket):
 def render_customer_context(customer):
     """Render customer context information"""
     
-    st.markdown("**👥 Kunde**")
-    
     support_tier_color = "🟢" if customer.support_tier.value == "Premium" else "🟡"
     
+    # Header, contact details and purchases as one markdown element (list lines
+    # carry the block's indentation so st.markdown can dedent it as a whole)
+    purchases = "\n    ".join(
+        f"- {purchase.sku} ({purchase.installation_location})" for purchase in customer.purchases
+    )
     st.markdown(f"""
+    **👥 Kunde**
+    
     {support_tier_color} **{customer.name}**
     
     📧 {customer.contact_person.email}
@@ -267,10 +303,9 @@ def render_customer_context(customer):
     📅 Kunde seit {customer.customer_since}
     
     **Produkte:**
-    """)
     
-    for purchase in customer.purchases:
-        st.markdown(f"• {purchase.sku} ({purchase.installation_location})")
+    {purchases}
+    """)
     
     if customer.notes:
         with st.expander("📝 Notizen"):
@@ -283,11 +318,7 @@ def render_ticket_metadata(ticket):
     st.markdown("**📊 Ticket-Details**")
     
     # Status badge
-    status_color = {
-        'open': '🔴',
-        'in_progress': '🟡',
-        'closed': '🟢'
-    }.get(ticket.status.value, '⚪')
+    status_color = _STATUS_COLORS.get(ticket.status.value, '⚪')
     
     st.markdown(f"""
     {status_color} {get_status_text(ticket.status.value)}
@@ -303,67 +334,29 @@ def render_ticket_metadata(ticket):
 
 def get_priority_badge(priority: str) -> str:
     """Get priority badge with appropriate color"""
-    priority_badges = {
-        'low': '🟢 Niedrig',
-        'medium': '🟡 Mittel',
-        'high': '🟠 Hoch',
-        'critical': '🔴 Kritisch'
-    }
-    return priority_badges.get(priority.lower(), f"⚪ {priority}")
+    return _PRIORITY_BADGES.get(priority.lower(), f"⚪ {priority}")
 
 
 def get_product_info(sku: str) -> str:
     """Get product information by SKU"""
-    demo_data = st.session_state.get('demo_data', {})
-    crm_data = demo_data.get('crm')
-    
-    if crm_data:
-        for product in crm_data.products:
-            if product.sku == sku:
-                return f"{product.name} ({product.type})"
+    product = get_products_by_sku().get(sku)
+    if product:
+        return f"{product.name} ({product.type})"
     
     return "Unbekanntes Produkt"
 
 
-def format_datetime(datetime_str: str) -> str:
-    """Format datetime string for display"""
-    try:
-        from datetime import datetime
-        dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-        return dt.strftime('%d.%m.%Y %H:%M')
-    except:
-        return datetime_str
-
-
-def get_company_name_from_customer_id(customer_id: str, crm_data) -> str:
-    """Get company name from customer ID"""
-    for customer in crm_data.customers:
-        if customer.id == customer_id:
-            return customer.name
-    return ""
-
-
-def get_contact_name_from_customer_id(customer_id: str, crm_data) -> str:
-    """Get contact person name from customer ID"""
-    for customer in crm_data.customers:
-        if customer.id == customer_id:
-            return customer.contact_person.name
-    return ""
-
-
-def get_contact_email_from_customer_id(customer_id: str, crm_data) -> str:
-    """Get contact email from customer ID"""
-    for customer in crm_data.customers:
-        if customer.id == customer_id:
-            return customer.contact_person.email
-    return ""
+def get_contact(customer_id: str) -> ContactInfo:
+    """Get company name, contact name and contact email from customer ID"""
+    customer = get_customers_by_id().get(customer_id)
+    if not customer:
+        return _NO_CONTACT
+    return ContactInfo(customer.name, customer.contact_person.name, customer.contact_person.email)
 
 
 def is_valid_email(email: str) -> bool:
     """Simple email validation"""
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 
 def create_ticket_from_form(title: str, description: str, company_name: str, contact_name: str, contact_email: str, priority: str, product_skus: list) -> Ticket:
@@ -380,33 +373,3 @@ def create_ticket_from_form(title: str, description: str, company_name: str, con
         created_by=contact_email
     )
     return ticket
-
-
-def load_demo_data():
-    """Load demo data with error handling"""
-    try:
-        if 'demo_data' not in st.session_state:
-            crm_data, tickets, manuals, sops = load_all_data()
-            from app.core.data import load_closing_notes
-            closing_notes = load_closing_notes()
-            st.session_state.demo_data = {
-                'crm': crm_data,
-                'tickets': tickets,
-                'manuals': manuals,
-                'sops': sops,
-                'closing_notes': closing_notes
-            }
-        return st.session_state.demo_data
-    except Exception as e:
-        st.error(f"Fehler beim Laden der Demo-Daten: {e}")
-        return None
-
-
-def get_status_text(status: str) -> str:
-    """Get German status text"""
-    status_map = {
-        'open': get_text('status_open'),
-        'closed': get_text('status_closed'),
-        'in_progress': get_text('status_in_progress')
-    }
-    return status_map.get(status.lower(), status)
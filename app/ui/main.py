@@ -4,26 +4,57 @@ Main application entry point
 """
 
 import streamlit as st
+import importlib
 from typing import Dict, Any
 
-# Import our core data functions
 import sys
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from app.core.data import load_all_data, DataLoader
-from app.core.models import Ticket, TicketStatus
-
-# Import UI components
-from components.sidebar import render_sidebar
-from components.context import render_context_section
-from components.ticket import render_ticket_section
-from components.research import render_research_section
-from components.planning import render_planning_section
-from components.execution import render_execution_section
-from components.closing import render_closing_section
-from utils.state import initialize_session_state, get_workflow_state, navigate_to_stage, get_stage_status
-from utils.german import GERMAN_TEXT
+# Make the repository root importable (streamlit run app/ui/main.py). Streamlit
+# re-executes this script on every rerun, so only add the entry once.
+_REPO_ROOT = str(Path(__file__).resolve().parents[2])
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+# Import UI components by their package path (stage sections are imported on
+# first use, see render_main_content). The components import app.ui.* as well,
+# so every module - and its st.cache_* entries - is loaded exactly once.
+from app.ui.components.sidebar import render_sidebar
+from app.ui.utils.data_cache import prewarm_demo_data
+from app.ui.utils.state import initialize_session_state, get_workflow_state, navigate_to_stage, get_all_stage_statuses
+
+
+# Section renderer per workflow stage as (module, function)
+_STAGE_SECTIONS = {
+    'context': ('app.ui.components.context', 'render_context_section'),
+    'ticket_input': ('app.ui.components.ticket', 'render_ticket_section'),
+    'research': ('app.ui.components.research', 'render_research_section'),
+    'planning': ('app.ui.components.planning', 'render_planning_section'),
+    'execution': ('app.ui.components.execution', 'render_execution_section'),
+    'closing': ('app.ui.components.closing', 'render_closing_section'),
+}
+
+# Header markup with its stylesheet. Streamlit drops elements that a rerun does
+# not emit again, so the styles cannot be sent once per session; sending them
+# in the header element avoids a separate CSS element on every rerun.
+_HEADER_HTML = """
+<style>
+.main-header {
+    background: linear-gradient(90deg, #1f4e79 0%, #2e6da4 100%);
+    padding: 1rem;
+    border-radius: 10px;
+    margin-bottom: 2rem;
+}
+</style>
+<div class="main-header">
+    <h1 style="color: white; margin: 0;">
+        🔧 Agentischer Ticket Assistent
+    </h1>
+    <p style="color: #e3f2fd; margin: 0; font-size: 1.1rem;">
+        Pumpen GmbH
+    </p>
+</div>
+"""
 
 
 def main():
@@ -40,34 +71,8 @@ def main():
     # Initialize session state
     initialize_session_state()
     
-    # Custom CSS
-    st.markdown("""
-    <style>
-    .main-header {
-        background: linear-gradient(90deg, #1f4e79 0%, #2e6da4 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-    }
-    .workflow-step {
-        border: 2px solid #e1e5e9;
-        border-radius: 8px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
-    .workflow-step.active {
-        border-color: #007bff;
-        background-color: #f8f9fa;
-    }
-    .workflow-step.complete {
-        border-color: #28a745;
-        background-color: #d4edda;
-    }
-    .german-business {
-        font-family: 'Segoe UI', system-ui, sans-serif;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Load the demo data in the background while the first page renders
+    prewarm_demo_data()
     
     # Main header
     render_header()
@@ -80,17 +85,8 @@ def main():
 
 
 def render_header():
-    """Render the main application header"""
-    st.markdown("""
-    <div class="main-header">
-        <h1 style="color: white; margin: 0;">
-            🔧 Agentischer Ticket Assistent
-        </h1>
-        <p style="color: #e3f2fd; margin: 0; font-size: 1.1rem;">
-            Pumpen GmbH
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    """Render the main application header (styles included, one element per rerun)"""
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
 
 def render_main_content():
@@ -100,26 +96,17 @@ def render_main_content():
     # Workflow progress indicator
     render_workflow_progress(workflow_state)
     
-    # Main content based on current stage
-    if workflow_state.get('current_stage') == 'context':
-        render_context_section()
-    elif workflow_state.get('current_stage') == 'ticket_input':
-        render_ticket_section()
-    elif workflow_state.get('current_stage') == 'research':
-        render_research_section()
-    elif workflow_state.get('current_stage') == 'planning':
-        render_planning_section()
-    elif workflow_state.get('current_stage') == 'execution':
-        render_execution_section()
-    elif workflow_state.get('current_stage') == 'closing':
-        render_closing_section()
-    else:
-        # Default: context stage
-        render_context_section()
+    # Main content based on current stage (default: context stage). Only the
+    # active stage's module is imported, so a cold start skips the others.
+    module_name, function_name = _STAGE_SECTIONS.get(
+        workflow_state.get('current_stage'), _STAGE_SECTIONS['context']
+    )
+    getattr(importlib.import_module(module_name), function_name)()
 
 
+@st.fragment
 def render_workflow_progress(workflow_state: Dict[str, Any]):
-    """Render interactive workflow progress indicator"""
+    """Render interactive workflow progress indicator (fragment - navigation reruns the app)"""
     st.markdown("### 📋 Workflow-Fortschritt")
     
     # Progress steps (6-step workflow: 0-5)
@@ -132,20 +119,21 @@ def render_workflow_progress(workflow_state: Dict[str, Any]):
         ("closing", "5. Abschluss", "✅")
     ]
     
-    current_stage = workflow_state.get('current_stage', 'context')
+    # Status of all stages from a single pass over the workflow state
+    stage_statuses = get_all_stage_statuses()
     
     # Create progress columns
     cols = st.columns(len(steps))
     
     for i, (stage_id, stage_name, icon) in enumerate(steps):
         with cols[i]:
-            status = get_stage_status(stage_id)
+            status = stage_statuses[stage_id]
             
             if status == 'completed':
                 # Completed stages are clickable
                 if st.button(f"{icon} {stage_name}", key=f"nav_{stage_id}", help="Zurück zu diesem Schritt"):
                     if navigate_to_stage(stage_id):
-                        st.rerun()
+                        st.rerun(scope="app")
                 st.success("✅ Abgeschlossen")
                 
             elif status == 'current':
@@ -156,7 +144,7 @@ def render_workflow_progress(workflow_state: Dict[str, Any]):
                 # Next available stage (only next in sequence)
                 if st.button(f"{icon} {stage_name}", key=f"nav_next_{stage_id}", help="Zu diesem Schritt"):
                     if navigate_to_stage(stage_id):
-                        st.rerun()
+                        st.rerun(scope="app")
                         
             else:
                 # Locked stages
@@ -167,33 +155,5 @@ def render_workflow_progress(workflow_state: Dict[str, Any]):
     st.markdown("---")
 
 
-def load_demo_data():
-    """Load demo data with error handling"""
-    try:
-        if 'demo_data' not in st.session_state:
-            crm_data, tickets, manuals, sops = load_all_data()
-            from app.core.data import load_closing_notes
-            closing_notes = load_closing_notes()
-            st.session_state.demo_data = {
-                'crm': crm_data,
-                'tickets': tickets,
-                'manuals': manuals,
-                'sops': sops,
-                'closing_notes': closing_notes
-            }
-        return st.session_state.demo_data
-    except Exception as e:
-        st.error(f"Fehler beim Laden der Demo-Daten: {e}")
-        return None
-
-
-def get_demo_tickets():
-    """Get available demo tickets"""
-    demo_data = load_demo_data()
-    if demo_data:
-        return [t for t in demo_data['tickets'] if t.status == TicketStatus.OPEN]
-    return []
-
-
 if __name__ == "__main__":
     main()
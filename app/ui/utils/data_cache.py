@@ -0,0 +1,108 @@
+"""
+Process-wide cached access to the demo data for the Streamlit UI
+"""
+
+import streamlit as st
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from app.core.data import load_all_data, load_closing_notes
+from app.core.models import CRMData, Customer, Product, Ticket, ManualSection, TicketStatus
+
+
+class DemoCorpus(NamedTuple):
+    """Demo data set shared by all sessions (unpacks like load_all_data())"""
+    crm: CRMData
+    tickets: List[Ticket]
+    manuals: List[ManualSection]
+    sops: str
+
+
+@st.cache_resource(show_spinner=False)
+def get_demo_data() -> DemoCorpus:
+    """
+    Load CRM data, tickets, manuals and SOPs once per process
+    
+    Shared by all sessions and reruns - treat the returned objects as read-only.
+    
+    Returns:
+        DemoCorpus with the data returned by load_all_data()
+    """
+    return DemoCorpus(*load_all_data())
+
+
+def load_demo_data() -> Optional[DemoCorpus]:
+    """Cached demo data, or None (after showing an error) if it cannot be loaded"""
+    try:
+        return get_demo_data()
+    except Exception as e:
+        # Failures are not cached, so the next rerun tries again
+        st.error(f"Fehler beim Laden der Demo-Daten: {e}")
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def get_open_tickets() -> List[Ticket]:
+    """Open demo tickets, filtered once per process"""
+    return [t for t in get_demo_data().tickets if t.status == TicketStatus.OPEN]
+
+
+@st.cache_resource(show_spinner=False)
+def get_customers_by_id() -> Dict[str, Customer]:
+    """CRM customers keyed by customer ID, indexed once per process"""
+    return {customer.id: customer for customer in get_demo_data().crm.customers}
+
+
+@st.cache_resource(show_spinner=False)
+def get_products_by_sku() -> Dict[str, Product]:
+    """CRM products keyed by SKU, indexed once per process"""
+    return {product.sku: product for product in get_demo_data().crm.products}
+
+
+@st.cache_resource(show_spinner=False)
+def get_closing_notes():
+    """Load the demo closing notes once per process (read-only)"""
+    return load_closing_notes()
+
+
+@st.cache_resource(show_spinner=False)
+def get_manual_markdown_by_sku():
+    """
+    Full handbook markdown per product SKU, built once per process
+    
+    Returns:
+        Dict mapping SKU to the concatenated markdown of all its manual sections
+    """
+    sections_by_sku = {}
+    for manual in get_demo_data().manuals:
+        sections_by_sku.setdefault(manual.product_sku, []).append(
+            f"### {manual.title}\n\n{manual.content}\n\n"
+        )
+    
+    return {sku: "".join(sections) for sku, sections in sections_by_sku.items()}
+
+
+@st.cache_resource(show_spinner=False)
+def prewarm_demo_data() -> threading.Thread:
+    """
+    Start loading the demo data and its lookups in a background thread
+    
+    Runs once per process; the loaders above are cached, so the first page
+    that needs them finds them ready (or waits on the load already in flight).
+    
+    Returns:
+        The started daemon thread
+    """
+    def warm():
+        try:
+            get_demo_data()
+            get_open_tickets()
+            get_customers_by_id()
+            get_products_by_sku()
+        except Exception:
+            # load_demo_data() reports load errors where the data is needed
+            pass
+    
+    thread = threading.Thread(target=warm, name="demo-data-prewarm", daemon=True)
+    thread.start()
+    return thread
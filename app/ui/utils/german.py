@@ -2,7 +2,9 @@
 German text constants for the UI
 """
 
-GERMAN_TEXT = {
+from types import MappingProxyType
+
+_GERMAN_TEXT = {
     # Main interface
     'app_title': 'Pumpen GmbH - Agentischer Ticket Assistent',
     'app_subtitle': 'Agentischer Ticket Assistent',
@@ -181,37 +183,54 @@ GERMAN_TEXT = {
 }
 
 
+# Public read-only view; get_text reads the underlying dict directly
+GERMAN_TEXT = MappingProxyType(_GERMAN_TEXT)
+
+
 def get_text(key: str, default: str = None) -> str:
     """Get German text by key"""
-    return GERMAN_TEXT.get(key, default or key)
+    return _GERMAN_TEXT.get(key, default or key)
+
+
+# Value-to-text lookups, resolved once at import (the UI text is static)
+_PRIORITY_TEXTS = {
+    'low': get_text('priority_low'),
+    'medium': get_text('priority_medium'),
+    'high': get_text('priority_high'),
+    'critical': get_text('priority_critical')
+}
+
+_STATUS_TEXTS = {
+    'open': get_text('status_open'),
+    'closed': get_text('status_closed'),
+    'in_progress': get_text('status_in_progress')
+}
+
+_DIFFICULTY_TEXTS = {
+    'easy': get_text('difficulty_easy'),
+    'moderate': get_text('difficulty_moderate'),
+    'hard': get_text('difficulty_hard')
+}
+
+
+def _lookup_text(texts, value: str) -> str:
+    """Look up value as passed (usually already lowercase), case-folding only on a miss"""
+    text = texts.get(value)
+    if text is None:
+        text = texts.get(value.lower(), value)
+    return text
 
 
 def get_priority_text(priority: str) -> str:
     """Get German priority text"""
-    priority_map = {
-        'low': get_text('priority_low'),
-        'medium': get_text('priority_medium'),
-        'high': get_text('priority_high'),
-        'critical': get_text('priority_critical')
-    }
-    return priority_map.get(priority.lower(), priority)
+    return _lookup_text(_PRIORITY_TEXTS, priority)
 
 
 def get_status_text(status: str) -> str:
     """Get German status text"""
-    status_map = {
-        'open': get_text('status_open'),
-        'closed': get_text('status_closed'),
-        'in_progress': get_text('status_in_progress')
-    }
-    return status_map.get(status.lower(), status)
+    return _lookup_text(_STATUS_TEXTS, status)
 
 
 def get_difficulty_text(difficulty: str) -> str:
     """Get German difficulty text"""
-    difficulty_map = {
-        'easy': get_text('difficulty_easy'),
-        'moderate': get_text('difficulty_moderate'),
-        'hard': get_text('difficulty_hard')
-    }
-    return difficulty_map.get(difficulty.lower(), difficulty)
+    return _lookup_text(_DIFFICULTY_TEXTS, difficulty)
@@ -3,7 +3,51 @@ Session state management for Streamlit UI
 """
 
 import streamlit as st
-from typing import Dict, Any, Set
+from types import MappingProxyType
+from typing import Dict, Any
+
+# Workflow stages in order, and the stage that follows each one
+_WORKFLOW_STAGES = ('context', 'ticket_input', 'research', 'planning', 'execution', 'closing')
+_NEXT_STAGE = dict(zip(_WORKFLOW_STAGES, _WORKFLOW_STAGES[1:]))
+
+# Initial workflow state (read-only template, see _new_workflow_state)
+_DEFAULT_WORKFLOW_STATE = MappingProxyType({
+    'current_stage': 'context',
+    'completed_stages': (),
+    'selected_ticket': None,
+    'research_results': None,
+    'plan': None,
+    'plan_approved': False,
+    'execution_results': None,
+    'summary': None
+})
+
+
+# Session keys preserved by complete_workflow_reset (str.startswith accepts the tuple)
+_STREAMLIT_INTERNAL_PREFIXES = (
+    '_',           # Streamlit internal keys typically start with underscore
+    'FormSubmitter',
+    'file_uploader'
+)
+
+
+# Known cache keys cleared by manual_key_reset (fallback list)
+_CACHE_KEYS_TO_CLEAR = frozenset({
+    'demo_data_loaded', 'research_results', 'research_state', 'research_job',
+    'embeddings_cache',
+    'manual_search_cache', 'selected_ticket_cache', 'customer_search_cache',
+    'similarity_search_cache', 'planning_results', 'execution_results',
+    'closing_results', 'ticket_analysis_cache', 'ai_responses_cache',
+    'llm_client_cache', 'context_data', 'ticket_input_data', 'plan_approved',
+    'execution_status'
+})
+
+
+def _new_workflow_state() -> Dict[str, Any]:
+    """Fresh workflow state; completed_stages gets its own mutable list"""
+    workflow_state = dict(_DEFAULT_WORKFLOW_STATE)
+    workflow_state['completed_stages'] = []
+    return workflow_state
 
 
 def initialize_session_state():
@@ -11,16 +55,7 @@ def initialize_session_state():
     
     # Workflow state
     if 'workflow_state' not in st.session_state:
-        st.session_state.workflow_state = {
-            'current_stage': 'context',
-            'completed_stages': set(),
-            'selected_ticket': None,
-            'research_results': None,
-            'plan': None,
-            'plan_approved': False,
-            'execution_results': None,
-            'summary': None
-        }
+        st.session_state.workflow_state = _new_workflow_state()
     
     # Configuration state
     if 'config' not in st.session_state:
@@ -47,56 +82,41 @@ def update_workflow_state(updates: Dict[str, Any]):
 
 
 def advance_to_stage(stage: str):
-    """Advance workflow to next stage"""
-    # Ensure workflow_state exists before accessing it
-    if 'workflow_state' not in st.session_state:
-        initialize_session_state()
-    
-    current_stage = st.session_state.workflow_state['current_stage']
-    
-    # Add current stage to completed
-    completed = st.session_state.workflow_state['completed_stages']
-    if isinstance(completed, set):
-        completed.add(current_stage)
-    else:
-        completed = {current_stage}
+    """Advance workflow to next stage (main() runs initialize_session_state first)"""
+    workflow_state = st.session_state.workflow_state
     
-    # Update state
-    st.session_state.workflow_state.update({
-        'current_stage': stage,
-        'completed_stages': completed
-    })
+    # Add current stage to completed (an ordered list without duplicates, at
+    # most six entries - see _new_workflow_state)
+    completed_stages = workflow_state['completed_stages']
+    if workflow_state['current_stage'] not in completed_stages:
+        completed_stages.append(workflow_state['current_stage'])
+    workflow_state['current_stage'] = stage
 
 
 def navigate_to_stage(stage: str):
     """Navigate to any stage (for backward navigation)"""
-    # Get valid stages in order
-    valid_stages = ['context', 'ticket_input', 'research', 'planning', 'execution', 'closing']
-    current_stage = st.session_state.workflow_state['current_stage']
-    completed_stages = st.session_state.workflow_state['completed_stages']
+    workflow_state = st.session_state.workflow_state
+    current_stage = workflow_state['current_stage']
+    completed_stages = workflow_state['completed_stages']
     
     # Allow navigation to completed stages or current stage
     if stage in completed_stages or stage == current_stage:
-        st.session_state.workflow_state['current_stage'] = stage
+        workflow_state['current_stage'] = stage
         return True
     
-    # Allow navigation to the next logical stage if current is completed
-    if current_stage in completed_stages:
-        current_index = valid_stages.index(current_stage)
-        target_index = valid_stages.index(stage)
-        
-        # Allow navigation to next stage only
-        if target_index == current_index + 1:
-            st.session_state.workflow_state['current_stage'] = stage
-            return True
+    # Allow navigation to the next logical stage (only) if current is completed
+    if current_stage in completed_stages and _NEXT_STAGE.get(current_stage) == stage:
+        workflow_state['current_stage'] = stage
+        return True
     
     return False
 
 
 def can_navigate_to_stage(stage: str) -> bool:
     """Check if navigation to a stage is allowed"""
-    current_stage = st.session_state.workflow_state['current_stage']
-    completed_stages = st.session_state.workflow_state['completed_stages']
+    workflow_state = st.session_state.workflow_state
+    current_stage = workflow_state['current_stage']
+    completed_stages = workflow_state['completed_stages']
     
     # Always allow navigation to completed stages or current stage
     if stage in completed_stages or stage == current_stage:
@@ -104,21 +124,16 @@ def can_navigate_to_stage(stage: str) -> bool:
     
     # Allow navigation to next stage if current is completed
     if current_stage in completed_stages:
-        valid_stages = ['context', 'ticket_input', 'research', 'planning', 'execution', 'closing']
-        try:
-            current_index = valid_stages.index(current_stage)
-            target_index = valid_stages.index(stage)
-            return target_index == current_index + 1
-        except ValueError:
-            return False
+        return _NEXT_STAGE.get(current_stage) == stage
     
     return False
 
 
 def get_stage_status(stage: str) -> str:
     """Get the status of a workflow stage"""
-    current_stage = st.session_state.workflow_state['current_stage']
-    completed_stages = st.session_state.workflow_state['completed_stages']
+    workflow_state = st.session_state.workflow_state
+    current_stage = workflow_state['current_stage']
+    completed_stages = workflow_state['completed_stages']
     
     if stage in completed_stages:
         return 'completed'
@@ -130,18 +145,31 @@ def get_stage_status(stage: str) -> str:
         return 'locked'
 
 
+def get_all_stage_statuses() -> Dict[str, str]:
+    """Get the status of every workflow stage in one pass, in workflow order"""
+    workflow_state = st.session_state.workflow_state
+    current_stage = workflow_state['current_stage']
+    completed_stages = workflow_state['completed_stages']
+    
+    # Only the stage right after a completed current stage is available
+    next_stage = _NEXT_STAGE.get(current_stage) if current_stage in completed_stages else None
+    
+    statuses = {}
+    for stage in _WORKFLOW_STAGES:
+        if stage in completed_stages:
+            statuses[stage] = 'completed'
+        elif stage == current_stage:
+            statuses[stage] = 'current'
+        elif stage == next_stage:
+            statuses[stage] = 'available'
+        else:
+            statuses[stage] = 'locked'
+    return statuses
+
+
 def reset_workflow():
     """Reset workflow to initial state (DEPRECATED - use complete_workflow_reset)"""
-    st.session_state.workflow_state = {
-        'current_stage': 'context',
-        'completed_stages': set(),
-        'selected_ticket': None,
-        'research_results': None,
-        'plan': None,
-        'plan_approved': False,
-        'execution_results': None,
-        'summary': None
-    }
+    st.session_state.workflow_state = _new_workflow_state()
 
 
 def complete_workflow_reset():
@@ -149,27 +177,13 @@ def complete_workflow_reset():
     
     try:
         # NUCLEAR OPTION: Clear everything except Streamlit internals
-        streamlit_internal_prefixes = {
-            '_',           # Streamlit internal keys typically start with underscore
-            'FormSubmitter',
-            'file_uploader'
-        }
-        
         # Get debug mode before clearing (to preserve user preference)
         debug_mode = False
         if 'config' in st.session_state:
             debug_mode = st.session_state.config.get('debug_mode', False)
         
-        # Clear all non-internal keys
-        keys_to_delete = []
-        for key in list(st.session_state.keys()):
-            # Preserve keys that start with underscore or known Streamlit internals
-            is_internal = any(key.startswith(prefix) for prefix in streamlit_internal_prefixes)
-            if not is_internal:
-                keys_to_delete.append(key)
-        
-        # Delete all identified keys
-        for key in keys_to_delete:
+        # Clear all non-internal keys (collected first - the mapping changes while deleting)
+        for key in [key for key in st.session_state if not key.startswith(_STREAMLIT_INTERNAL_PREFIXES)]:
             del st.session_state[key]
         
         # Force complete reinitialization from scratch
@@ -187,35 +201,15 @@ def complete_workflow_reset():
 def manual_key_reset():
     """Fallback manual reset for safety (original approach)"""
     
-    # Known cache keys to clear (fallback list)
-    cache_keys_to_clear = [
-        'demo_data', 'demo_data_loaded', 'research_results', 'embeddings_cache',
-        'manual_search_cache', 'selected_ticket_cache', 'customer_search_cache',
-        'similarity_search_cache', 'planning_results', 'execution_results',
-        'closing_results', 'ticket_analysis_cache', 'ai_responses_cache',
-        'llm_client_cache', 'context_data', 'ticket_input_data', 'plan_approved',
-        'execution_status'
-    ]
-    
     # Preserve debug mode
     debug_mode = st.session_state.config.get('debug_mode', False) if 'config' in st.session_state else False
     
     # Reset workflow state
-    st.session_state.workflow_state = {
-        'current_stage': 'context',
-        'completed_stages': set(),
-        'selected_ticket': None,
-        'research_results': None,
-        'plan': None,
-        'plan_approved': False,
-        'execution_results': None,
-        'summary': None
-    }
-    
-    # Clear identified cache keys
-    for key in cache_keys_to_clear:
-        if key in st.session_state:
-            del st.session_state[key]
+    st.session_state.workflow_state = _new_workflow_state()
+    
+    # Clear the known cache keys that are present
+    for key in _CACHE_KEYS_TO_CLEAR.intersection(st.session_state.keys()):
+        del st.session_state[key]
     
     # Reset config to minimal defaults
     st.session_state.config = {'debug_mode': debug_mode}
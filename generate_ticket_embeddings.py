@@ -6,12 +6,19 @@ Generates OpenAI embeddings for all tickets in tickets.jsonl and saves them
 in a structured format for future similarity search operations.
 """
 
+import argparse
 import os
 import json
 import hashlib
+import random
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable, Tuple, TypeVar
+
+import numpy as np
 
 # Add app to Python path
 import sys
@@ -19,21 +26,108 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from app.core.llm_client import LLMClient
 from app.core.data import DataLoader
+from app.core.embeddings import load_vectors_file, vectors_file_digest
+
+try:
+    from openai import APIConnectionError, RateLimitError
+    RETRYABLE_ERRORS = (RateLimitError, APIConnectionError)
+except ImportError:  # No OpenAI SDK: nothing to retry, main() reports the missing client
+    RETRYABLE_ERRORS = ()
+
+try:
+    from tqdm import tqdm
+except ImportError:  # Optional: without it batches report progress as plain lines
+    tqdm = None
+
+try:
+    import tiktoken
+except ImportError:  # Token counts fall back to the UTF-8 byte count and nothing is truncated
+    tiktoken = None
+
+# Content hash used for change detection; records hashed differently are regenerated
+HASH_ALGORITHM = "blake2b-256"
+
+# Limits for packing texts into one embeddings request (the OpenAI endpoint
+# accepts a list input of up to 2048 texts and ~300K tokens in total)
+MAX_BATCH_ITEMS = 2048
+MAX_BATCH_TOKENS = 250_000
+# Per-input limit of the embedding model; longer content is truncated (needs tiktoken)
+MAX_INPUT_TOKENS = 8192
+
+T = TypeVar("T")
+
+def log(message: str):
+    """Print a message without breaking an active progress bar"""
+    if tqdm is not None:
+        tqdm.write(message)
+    else:
+        print(message)
+
+def retry_with_backoff(fn: Callable[[], T], max_attempts: int = 5, base: float = 1.0) -> T:
+    """
+    Call fn, retrying rate-limit and connection errors with exponential backoff
+    
+    Honours the Retry-After header when the API sends one and adds jitter so
+    concurrent batches don't retry in lockstep. The last error is re-raised once
+    all attempts are used up.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return fn()
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_attempts - 1:
+                raise
+            
+            retry_after = 0.0
+            response = getattr(e, "response", None)
+            if response is not None:
+                try:
+                    retry_after = float(response.headers.get("retry-after", 0))
+                except (TypeError, ValueError):
+                    pass  # HTTP-date form or malformed header: use the backoff delay
+            
+            delay = max(retry_after, base * 2 ** attempt) + random.uniform(0, 0.5)
+            log(f"   ⏳ {type(e).__name__}, retrying in {delay:.1f}s (attempt {attempt + 2}/{max_attempts})")
+            time.sleep(delay)
 
 class TicketEmbeddingGenerator:
     """Utility class for generating and managing ticket embeddings"""
     
-    def __init__(self, embeddings_file: str = "data/ticket_embeddings.json"):
+    def __init__(self, embeddings_file: str = "data/ticket_embeddings.json", max_in_flight: int = 5,
+                 verbose: bool = False):
         self.embeddings_file = Path(embeddings_file)
-        self.client = LLMClient(provider="openai")  # Use OpenAI for embeddings
+        self.vectors_file = self.embeddings_file.with_suffix('.npy')  # Embedding matrix, one row per record
+        self.checkpoint_file = self.embeddings_file.with_suffix('.checkpoint.jsonl')  # Progress of an unsaved run
+        self.max_in_flight = max_in_flight  # Concurrent batch requests
+        self.verbose = verbose  # Per-ticket status and content previews
+        # Use OpenAI for embeddings; one client, and so one keep-alive connection
+        # pool, is shared by all concurrent batch requests
+        self.client = LLMClient(provider="openai", max_connections=max(1, max_in_flight))
         self.data_loader = DataLoader()
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.encoding_for_model(self.client.embedding_model)
+            except Exception as e:
+                print(f"⚠️  tiktoken encoding unavailable, estimating tokens from byte count (no truncation): {e}")
         
     def load_existing_embeddings(self) -> Dict[str, Any]:
         """Load existing embeddings file or create empty structure"""
         if self.embeddings_file.exists():
             try:
                 with open(self.embeddings_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    data = json.load(f)
+                
+                # Vectors live in the .npy matrix; files written before the split
+                # still carry them inline and need no attaching. A matrix that
+                # doesn't match the records raises, and everything is regenerated
+                metadata = data.get("metadata", {})
+                if metadata.get("vectors_file"):
+                    records = data.get("embeddings", [])
+                    vectors = load_vectors_file(self.embeddings_file, metadata, len(records), mmap_mode='r')
+                    for row, record in enumerate(records):
+                        record["embedding"] = vectors[row]
+                return data
             except Exception as e:
                 print(f"⚠️  Error loading existing embeddings: {e}")
                 print("   Creating new embeddings file...")
@@ -65,16 +159,95 @@ class TicketEmbeddingGenerator:
             
         return "\n\n".join(content_parts)
     
+    def create_content_preview(self, content: str) -> str:
+        """Shorten content to the preview stored with each record"""
+        return content if len(content) <= 200 else content[:200] + "..."
+    
     def create_content_hash(self, content: str) -> str:
-        """Create SHA-256 hash of content for change detection"""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        """Create BLAKE2b (256-bit) hash of content for change detection"""
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=32).hexdigest()
+    
+    def should_update_embedding(self, ticket_id: str, content_hash: str, existing_map: Dict[str, Dict[str, Any]]) -> bool:
+        """Check if embedding needs to be updated, given existing records keyed by ticket_id"""
+        record = existing_map.get(ticket_id)
+        if record is None:
+            return True  # New ticket, needs embedding
+        # Records from before the hash switch carry no algorithm and are regenerated
+        return (record.get("hash_algorithm") != HASH_ALGORITHM
+                or record.get("content_hash") != content_hash)
+    
+    def load_checkpoint(self) -> Dict[Tuple[str, str], List[float]]:
+        """Load embeddings written by an interrupted run, keyed by (model, content_hash)"""
+        checkpointed = {}
+        if not self.checkpoint_file.exists():
+            return checkpointed
+        
+        with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Line cut off by the interruption
+                if entry.get("hash_algorithm") == HASH_ALGORITHM:
+                    checkpointed[(entry["model"], entry["content_hash"])] = entry["embedding"]
+        
+        if checkpointed:
+            print(f"♻️  Resuming with {len(checkpointed)} embeddings from {self.checkpoint_file}")
+        return checkpointed
+    
+    def fit_to_input_limit(self, content: str) -> Tuple[str, int]:
+        """
+        Truncate content to MAX_INPUT_TOKENS, returning it with its token count
+        
+        Tokens are counted with tiktoken. Without it the content is returned
+        unchanged: the UTF-8 byte count (an overestimate, since every BPE token
+        covers at least one byte) is only good for packing batches, not for
+        deciding where to cut.
+        """
+        if self.encoding is None:
+            return content, len(content.encode('utf-8'))
+        
+        tokens = self.encoding.encode(content)
+        if len(tokens) <= MAX_INPUT_TOKENS:
+            return content, len(tokens)
+        return self.encoding.decode(tokens[:MAX_INPUT_TOKENS]), MAX_INPUT_TOKENS
     
-    def should_update_embedding(self, ticket_id: str, content_hash: str, existing_embeddings: Dict) -> bool:
-        """Check if embedding needs to be updated"""
-        for embedding in existing_embeddings.get("embeddings", []):
-            if embedding.get("ticket_id") == ticket_id:
-                return embedding.get("content_hash") != content_hash
-        return True  # New ticket, needs embedding
+    @staticmethod
+    def pack_batches(pending: List[Tuple[str, str, int]]) -> List[List[Tuple[str, str, int]]]:
+        """Greedily pack (content_hash, content, token_count) entries into request-sized batches"""
+        batches = []
+        batch, batch_tokens = [], 0
+        for entry in pending:
+            token_count = entry[2]
+            if batch and (len(batch) >= MAX_BATCH_ITEMS or batch_tokens + token_count > MAX_BATCH_TOKENS):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(entry)
+            batch_tokens += token_count
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def request_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Request embeddings for one batch of texts, raising if the batch fails or comes back incomplete"""
+        vectors = retry_with_backoff(lambda: self.client.get_embeddings_batch(texts, raise_on_error=True))
+        if len(vectors) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(vectors)}")
+        return vectors
+    
+    def create_embedding_record(self, ticket_id: str, content: str, content_hash: str,
+                                embedding: List[float], token_count: int, generated_at: str,
+                                content_preview: Optional[str] = None) -> Dict[str, Any]:
+        """Build the stored record for one ticket embedding"""
+        return {
+            "ticket_id": ticket_id,
+            "content_hash": content_hash,
+            "hash_algorithm": HASH_ALGORITHM,
+            "embedding": embedding,
+            "content_preview": content_preview if content_preview is not None else self.create_content_preview(content),
+            "generated_at": generated_at,
+            "token_count": token_count
+        }
     
     def generate_embeddings(self, force_regenerate: bool = False) -> Dict[str, Any]:
         """Generate embeddings for all tickets"""
@@ -83,6 +256,8 @@ class TicketEmbeddingGenerator:
         # Load existing embeddings and tickets
         existing_data = self.load_existing_embeddings()
         tickets = self.data_loader.load_tickets()
+        model = self.client.embedding_model
+        run_timestamp = datetime.now().isoformat()  # Shared by every record generated in this run
         
         print(f"📄 Found {len(tickets)} tickets to process")
         
@@ -90,71 +265,167 @@ class TicketEmbeddingGenerator:
         stats = {
             "processed": 0,
             "skipped": 0,
+            "reused": 0,
             "errors": 0,
             "total_tokens": 0
         }
         
-        updated_embeddings = []
         existing_embeddings = {e["ticket_id"]: e for e in existing_data.get("embeddings", [])}
         
-        for i, ticket in enumerate(tickets, 1):
-            print(f"\n📋 Processing ticket {i}/{len(tickets)}: {ticket.ticket_id}")
-            
-            # Create embedding content
-            content = self.create_embedding_content(ticket)
-            content_hash = self.create_content_hash(content)
+        # Content-addressed cache: identical content embedded with the same model
+        # gets the same vector, whichever ticket it was generated for
+        existing_model = existing_data.get("metadata", {}).get("model")
+        hash_to_embedding: Dict[Tuple[str, str], List[float]] = {}
+        if not force_regenerate:
+            hash_to_embedding = {
+                (existing_model, e["content_hash"]): e["embedding"]
+                for e in existing_data.get("embeddings", [])
+                if e.get("hash_algorithm") == HASH_ALGORITHM
+            }
+        hash_to_embedding.update(self.load_checkpoint())
+        
+        # Records are slotted back by ticket index so the output keeps the tickets.jsonl order
+        records: List[Optional[Dict[str, Any]]] = [None] * len(tickets)
+        pending = []  # (content_hash, content, token_count) awaiting a new embedding, one per distinct content
+        waiting: Dict[str, List[Tuple[int, str]]] = {}  # content_hash -> (index, ticket_id) of its tickets
+        
+        # Build embedding content, token counts and hashes for all tickets up front
+        # (hashlib and tiktoken release the GIL, so these run in parallel). Content
+        # over the model's input limit is truncated before it is hashed, which needs
+        # tiktoken's exact token count
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            full_contents = list(executor.map(self.create_embedding_content, tickets))
+            fitted = list(executor.map(self.fit_to_input_limit, full_contents))
+            contents = [content for content, _ in fitted]
+            token_counts = [token_count for _, token_count in fitted]
+            content_hashes = list(executor.map(self.create_content_hash, contents))
+        
+        for ticket, full_content, content in zip(tickets, full_contents, contents):
+            if len(content) < len(full_content):
+                log(f"   ✂️  {ticket.ticket_id}: content truncated to {MAX_INPUT_TOKENS} tokens")
+        
+        for i, (ticket, content, content_hash, token_count) in enumerate(
+            zip(tickets, contents, content_hashes, token_counts)
+        ):
+            if self.verbose:
+                print(f"\n📋 Processing ticket {i + 1}/{len(tickets)}: {ticket.ticket_id}")
             
             # Check if update needed
             if not force_regenerate and not self.should_update_embedding(
-                ticket.ticket_id, content_hash, existing_data
+                ticket.ticket_id, content_hash, existing_embeddings
             ):
-                print(f"   ✅ Using existing embedding (content unchanged)")
-                updated_embeddings.append(existing_embeddings[ticket.ticket_id])
+                if self.verbose:
+                    print("   ✅ Using existing embedding (content unchanged)")
+                records[i] = existing_embeddings[ticket.ticket_id]
                 stats["skipped"] += 1
                 continue
             
-            # Generate new embedding
-            try:
-                print(f"   🔄 Generating embedding...")
-                print(f"   📝 Content preview: {content[:100]}...")
-                
-                embedding = self.client.get_embedding(content)
-                
-                # Verify embedding quality
-                if len(embedding) != 1536:
-                    raise ValueError(f"Unexpected embedding dimension: {len(embedding)}")
-                
-                # Create embedding record
-                embedding_record = {
-                    "ticket_id": ticket.ticket_id,
-                    "content_hash": content_hash,
-                    "embedding": embedding,
-                    "content_preview": content[:200] + "..." if len(content) > 200 else content,
-                    "generated_at": datetime.now().isoformat(),
-                    "token_count": len(content.split())  # Rough estimate
+            cached = hash_to_embedding.get((model, content_hash))
+            if cached is not None:
+                if self.verbose:
+                    print("   ♻️  Reusing embedding of identical content")
+                records[i] = self.create_embedding_record(
+                    ticket.ticket_id, content, content_hash, cached, token_count, run_timestamp
+                )
+                stats["reused"] += 1
+                continue
+            
+            if content_hash in waiting:
+                if self.verbose:
+                    print("   ♻️  Identical content already queued, sharing its embedding")
+            else:
+                if self.verbose:
+                    print("   🔄 Queued for embedding")
+                    print(f"   📝 Content preview: {self.create_content_preview(content)}")
+                pending.append((content_hash, content, token_count))
+                waiting[content_hash] = []
+            waiting[content_hash].append((i, ticket.ticket_id))
+        
+        # Generate new embeddings, one API request per batch of contents, with up to
+        # max_in_flight batches running concurrently (the SDK client is synchronous)
+        batches = self.pack_batches(pending)
+        print(f"📋 {stats['skipped']} unchanged, {stats['reused']} reused, {len(pending)} to embed")
+        if batches:
+            print(f"\n🔄 Generating {len(pending)} embeddings in {len(batches)} batches...")
+        
+        progress = tqdm(total=len(pending), desc="Embedding", unit="text") if tqdm is not None and pending else None
+        
+        # Each finished batch is appended to the checkpoint, so an interrupted run
+        # resumes from there instead of requesting those embeddings again. Without an
+        # OpenAI client the vectors are mocks, which must never be resumed as real ones
+        checkpoint_vectors = self.client.openai_client is not None
+        self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.checkpoint_file, 'a', encoding='utf-8') as checkpoint:
+            with ThreadPoolExecutor(max_workers=max(1, self.max_in_flight)) as executor:
+                futures = {
+                    executor.submit(self.request_embeddings_batch, [content for _, content, _ in batch]): batch
+                    for batch in batches
                 }
                 
-                updated_embeddings.append(embedding_record)
-                stats["processed"] += 1
-                stats["total_tokens"] += embedding_record["token_count"]
-                
-                print(f"   ✅ Embedding generated ({len(embedding)} dimensions)")
-                
-            except Exception as e:
-                print(f"   ❌ Failed to generate embedding: {e}")
-                # Keep existing embedding if available
-                if ticket.ticket_id in existing_embeddings:
-                    print(f"   🔄 Using existing embedding as fallback")
-                    updated_embeddings.append(existing_embeddings[ticket.ticket_id])
-                stats["errors"] += 1
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    try:
+                        vectors = future.result()
+                    except Exception as e:
+                        log(f"   ⚠️  Batch request failed ({e}), falling back to per-ticket requests")
+                        vectors = None
+                    
+                    for j, (content_hash, content, token_count) in enumerate(batch):
+                        try:
+                            # Retried and raising like the batch; get_embedding would fall back to a mock vector
+                            embedding = vectors[j] if vectors is not None else self.request_embeddings_batch([content])[0]
+                            
+                            # Verify embedding quality
+                            if len(embedding) != 1536:
+                                raise ValueError(f"Unexpected embedding dimension: {len(embedding)}")
+                            
+                        except Exception as e:
+                            for index, ticket_id in waiting[content_hash]:
+                                log(f"   ❌ Failed to generate embedding for {ticket_id}: {e}")
+                                # Keep existing embedding if available
+                                if ticket_id in existing_embeddings:
+                                    log("   🔄 Using existing embedding as fallback")
+                                    records[index] = existing_embeddings[ticket_id]
+                                stats["errors"] += 1
+                            continue
+                        
+                        content_preview = self.create_content_preview(content)  # Shared by all tickets with this content
+                        for index, ticket_id in waiting[content_hash]:
+                            records[index] = self.create_embedding_record(
+                                ticket_id, content, content_hash, embedding, token_count, run_timestamp,
+                                content_preview
+                            )
+                            stats["processed"] += 1
+                        stats["total_tokens"] += token_count  # Billed once per distinct content
+                        if checkpoint_vectors:
+                            checkpoint.write(json.dumps({
+                                "model": model,
+                                "content_hash": content_hash,
+                                "hash_algorithm": HASH_ALGORITHM,
+                                "embedding": list(embedding)
+                            }) + "\n")
+                    
+                    checkpoint.flush()
+                    os.fsync(checkpoint.fileno())
+                    
+                    if progress is not None:
+                        progress.update(len(batch))
+                    else:
+                        print(f"   ✅ Batch of {len(batch)} embeddings done")
+        
+        if progress is not None:
+            progress.close()
+        
+        updated_embeddings = [record for record in records if record is not None]
         
         # Update metadata
         result_data = {
             "metadata": {
                 "model": "text-embedding-3-small",
                 "dimension": 1536,
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": run_timestamp,
                 "version": "1.0",
+                "hash_algorithm": HASH_ALGORITHM,
                 "total_tickets": len(tickets),
                 "processing_stats": stats
             },
@@ -163,23 +434,75 @@ class TicketEmbeddingGenerator:
         
         return result_data
     
+    @staticmethod
+    def _backup_file(path: Path):
+        """Hardlink path to its .backup name (no bytes copied); copies where hardlinks are unsupported"""
+        backup_file = path.with_suffix(path.suffix + '.backup')
+        print(f"📄 Creating backup: {backup_file}")
+        backup_file.unlink(missing_ok=True)
+        try:
+            os.link(path, backup_file)
+        except OSError:
+            shutil.copyfile(path, backup_file)
+    
+    @staticmethod
+    def _write_atomically(path: Path, write: Callable[[Any], None], mode: str = 'w'):
+        """Write via a temp file swapped in with os.replace, so a crash never leaves a partial file"""
+        tmp_file = path.with_suffix(path.suffix + '.tmp')
+        encoding = None if 'b' in mode else 'utf-8'
+        with open(tmp_file, mode, encoding=encoding) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    
     def save_embeddings(self, embeddings_data: Dict[str, Any]):
-        """Save embeddings to file with backup"""
-        # Create backup if file exists
-        if self.embeddings_file.exists():
-            backup_file = self.embeddings_file.with_suffix('.json.backup')
-            print(f"📄 Creating backup: {backup_file}")
-            with open(self.embeddings_file, 'r') as src, open(backup_file, 'w') as dst:
-                dst.write(src.read())
+        """Save embedding vectors as a .npy matrix and records/metadata as JSON, with backup"""
+        # Create backups of the files that exist. New files are swapped in with
+        # os.replace, so the hardlinked backups keep the previous contents
+        for path in (self.embeddings_file, self.vectors_file):
+            if path.exists():
+                self._backup_file(path)
         
         # Ensure directory exists
         self.embeddings_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Save embeddings
-        with open(self.embeddings_file, 'w', encoding='utf-8') as f:
-            json.dump(embeddings_data, f, indent=2, ensure_ascii=False)
+        # Row i of the matrix belongs to embeddings[i]. Rows are unit-normalized and
+        # stored as float16: cosine similarity is unaffected by the rounding and
+        # the file is half the size of float32
+        records = embeddings_data["embeddings"]
+        vectors = np.asarray([record["embedding"] for record in records], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0  # Zero vectors stay zero
+        vectors = (vectors / norms).astype(np.float16)
+        self._write_atomically(self.vectors_file, lambda f: np.save(f, vectors), mode='wb')
         
-        print(f"💾 Embeddings saved to: {self.embeddings_file}")
+        # Save records and metadata without the vectors. The two files are replaced
+        # one after the other; the row count and digest let loaders detect a pair
+        # left mismatched by a crash in between
+        json_data = {
+            "metadata": {
+                **embeddings_data["metadata"],
+                "vectors_file": self.vectors_file.name,
+                "vector_rows": len(records),
+                "vectors_digest": vectors_file_digest(self.vectors_file),
+                "dtype": "float16",
+                "normalized": True
+            },
+            "embeddings": [
+                {key: value for key, value in record.items() if key != "embedding"}
+                for record in records
+            ]
+        }
+        self._write_atomically(
+            self.embeddings_file,
+            lambda f: json.dump(json_data, f, indent=2, ensure_ascii=False)
+        )
+        
+        # Everything in the checkpoint is now part of the saved files
+        self.checkpoint_file.unlink(missing_ok=True)
+        
+        print(f"💾 Embeddings saved to: {self.embeddings_file} (vectors: {self.vectors_file})")
     
     def validate_embeddings(self, embeddings_data: Dict[str, Any]) -> bool:
         """Validate generated embeddings"""
@@ -211,6 +534,7 @@ class TicketEmbeddingGenerator:
         print(f"📄 Total tickets: {metadata['total_tickets']}")
         print(f"✅ Processed: {stats.get('processed', 0)}")
         print(f"⏭️  Skipped (unchanged): {stats.get('skipped', 0)}")
+        print(f"♻️  Reused (identical content): {stats.get('reused', 0)}")
         print(f"❌ Errors: {stats.get('errors', 0)}")
         print(f"🔤 Estimated tokens: {stats.get('total_tokens', 0)}")
         print(f"📐 Embedding model: {metadata['model']}")
@@ -223,10 +547,14 @@ class TicketEmbeddingGenerator:
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Generate OpenAI embeddings for all tickets")
+    parser.add_argument("--verbose", action="store_true", help="Print per-ticket status and content previews")
+    args = parser.parse_args()
+    
     print("🚀 Ticket Embedding Generator")
     print("=" * 50)
     
-    generator = TicketEmbeddingGenerator()
+    generator = TicketEmbeddingGenerator(verbose=args.verbose)
     
     # Check if LLM client is working
     info = generator.client.get_provider_info()
@@ -0,0 +1,19 @@
+"""
+Shared fixtures for the data validation tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path so we can import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.data import load_all_data
+
+
+@pytest.fixture(scope="session")
+def all_data():
+    """Load the demo data once per test session: (crm_data, tickets, manuals, sops)"""
+    return load_all_data()
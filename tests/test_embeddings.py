@@ -0,0 +1,136 @@
+"""
+Tests for the embedding similarity search
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from app.core import llm_client
+from app.core.embeddings import EmbeddingManager, TicketEmbeddingSystem, vectors_file_digest
+from app.core.models import Ticket, TicketPriority, TicketStatus
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """EmbeddingManager over three 2-d embeddings at known angles to the x-axis"""
+    vectors = {
+        "T-A": [1.0, 0.0],   # similarity 1.0 to the x-axis
+        "T-B": [1.0, 1.0],   # ~0.707
+        "T-C": [0.0, 2.0],   # 0.0
+    }
+    embeddings_file = tmp_path / "ticket_embeddings.json"
+    embeddings_file.write_text(json.dumps({
+        "metadata": {"model": "test", "dimension": 2},
+        "embeddings": [
+            {
+                "ticket_id": ticket_id,
+                "content_hash": ticket_id,
+                "embedding": vector,
+                "content_preview": f"Preview {ticket_id}",
+                "generated_at": "2024-01-01T00:00:00",
+                "token_count": 1
+            }
+            for ticket_id, vector in vectors.items()
+        ]
+    }), encoding='utf-8')
+    return EmbeddingManager(str(embeddings_file))
+
+
+def test_results_sorted_by_similarity(manager):
+    """Results come back highest similarity first, with cosine scores"""
+    results = manager.find_similar_tickets([3.0, 0.0], top_k=3)
+    
+    assert [r.ticket_id for r in results] == ["T-A", "T-B", "T-C"]
+    assert [r.similarity for r in results] == pytest.approx([1.0, 0.5 ** 0.5, 0.0], abs=1e-6)
+    assert results[0].content_preview == "Preview T-A"
+
+
+def test_min_similarity_filters_results(manager):
+    """Candidates below min_similarity are dropped"""
+    results = manager.find_similar_tickets([1.0, 0.0], top_k=3, min_similarity=0.5)
+    
+    assert [r.ticket_id for r in results] == ["T-A", "T-B"]
+
+
+def test_top_k_larger_than_bank(manager):
+    """top_k beyond the number of embeddings returns every embedding"""
+    results = manager.find_similar_tickets([1.0, 0.0], top_k=10)
+    
+    assert [r.ticket_id for r in results] == ["T-A", "T-B", "T-C"]
+
+
+def test_top_k_limits_results(manager):
+    """Only the top_k best matches are returned"""
+    results = manager.find_similar_tickets([0.0, 1.0], top_k=1)
+    
+    assert [r.ticket_id for r in results] == ["T-C"]
+
+
+def test_dimension_mismatch_raises(manager):
+    """A query of the wrong dimension is rejected"""
+    with pytest.raises(ValueError, match="dimensions don't match"):
+        manager.find_similar_tickets([1.0, 0.0, 0.0])
+
+
+def test_find_similar_to_ticket_excludes_query(manager):
+    """The query ticket itself is not among its similar tickets"""
+    results = manager.find_similar_to_ticket("T-A", top_k=2)
+    
+    assert [r.ticket_id for r in results] == ["T-B", "T-C"]
+
+
+def test_manual_query_embeddings_keyed_by_content(monkeypatch):
+    """Unsaved tickets sharing the id "MANUAL" don't reuse each other's query embedding"""
+    requested = []
+    
+    def fake_get_embeddings_batch(self, texts, raise_on_error=False):
+        requested.extend(texts)
+        return [[float(len(requested)), 0.0]]
+    
+    monkeypatch.setattr(llm_client.LLMClient, "get_embeddings_batch", fake_get_embeddings_batch)
+    system = TicketEmbeddingSystem()
+    
+    def manual_ticket(body):
+        return Ticket(
+            ticket_id="MANUAL", customer_id="C-ACME", title="Pumpe", body=body,
+            related_skus=[], status=TicketStatus.OPEN, priority=TicketPriority.MEDIUM,
+            created_date="2024-01-01", created_by="test"
+        )
+    
+    first = system._get_or_generate_embedding(manual_ticket("Pumpe pfeift"))
+    second = system._get_or_generate_embedding(manual_ticket("Pumpe leckt"))
+    again = system._get_or_generate_embedding(manual_ticket("Pumpe pfeift"))
+    
+    assert first != second
+    assert again == first
+    assert len(requested) == 2
+    assert "MANUAL" not in system.embeddings_cache
+
+
+def test_vectors_file_with_wrong_row_count_is_not_loaded(tmp_path):
+    """Records are not paired with a .npy matrix that has a different number of rows"""
+    vectors_file = tmp_path / "ticket_embeddings.npy"
+    np.save(vectors_file, np.eye(3, dtype=np.float16))
+    embeddings_file = tmp_path / "ticket_embeddings.json"
+    embeddings_file.write_text(json.dumps({
+        "metadata": {
+            "model": "test", "dimension": 3, "vectors_file": vectors_file.name,
+            "vector_rows": 2, "vectors_digest": vectors_file_digest(vectors_file)
+        },
+        "embeddings": [
+            {
+                "ticket_id": ticket_id,
+                "content_hash": ticket_id,
+                "content_preview": f"Preview {ticket_id}",
+                "generated_at": "2024-01-01T00:00:00",
+                "token_count": 1
+            }
+            for ticket_id in ("T-A", "T-B")
+        ]
+    }), encoding='utf-8')
+    
+    manager = EmbeddingManager(str(embeddings_file))
+    
+    assert manager.embeddings == {}
@@ -0,0 +1,218 @@
+"""
+Tests for the batching and retry helpers of the embedding generator
+"""
+
+import numpy as np
+import openai
+import pytest
+
+try:
+    import httpx2 as httpx  # Newer openai releases are built on httpx2
+except ImportError:
+    import httpx
+
+import generate_ticket_embeddings as gte
+from generate_ticket_embeddings import TicketEmbeddingGenerator, retry_with_backoff
+
+
+def _entries(*token_counts):
+    """Pending (content_hash, content, token_count) entries with the given token counts"""
+    return [(f"hash-{i}", f"content {i}", tokens) for i, tokens in enumerate(token_counts)]
+
+
+def _rate_limit_error(retry_after=None):
+    """openai.RateLimitError with an optional Retry-After header"""
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    response = httpx.Response(
+        429, headers=headers, request=httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    )
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping; jitter is disabled"""
+    recorded = []
+    monkeypatch.setattr(gte.time, "sleep", recorded.append)
+    monkeypatch.setattr(gte.random, "uniform", lambda a, b: 0.0)
+    return recorded
+
+
+def test_pack_batches_splits_at_item_limit(monkeypatch):
+    """A batch is closed once it holds MAX_BATCH_ITEMS entries"""
+    monkeypatch.setattr(gte, "MAX_BATCH_ITEMS", 2)
+    
+    batches = TicketEmbeddingGenerator.pack_batches(_entries(1, 1, 1, 1, 1))
+    
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_pack_batches_splits_at_token_limit(monkeypatch):
+    """An entry that would push a batch over MAX_BATCH_TOKENS starts a new batch"""
+    monkeypatch.setattr(gte, "MAX_BATCH_TOKENS", 10)
+    
+    batches = TicketEmbeddingGenerator.pack_batches(_entries(4, 6, 1, 9, 1))
+    
+    # Exactly reaching the limit is allowed
+    assert [[entry[2] for entry in batch] for batch in batches] == [[4, 6], [1, 9], [1]]
+
+
+def test_pack_batches_oversized_entry_gets_own_batch(monkeypatch):
+    """An entry above MAX_BATCH_TOKENS on its own is still sent, alone in its batch"""
+    monkeypatch.setattr(gte, "MAX_BATCH_TOKENS", 10)
+    
+    batches = TicketEmbeddingGenerator.pack_batches(_entries(3, 25, 3))
+    
+    assert [[entry[2] for entry in batch] for batch in batches] == [[3], [25], [3]]
+
+
+def test_pack_batches_keeps_order_and_handles_empty():
+    """Entries keep their order across batches; nothing pending means no batches"""
+    pending = _entries(1, 2, 3)
+    
+    assert TicketEmbeddingGenerator.pack_batches(pending) == [pending]
+    assert TicketEmbeddingGenerator.pack_batches([]) == []
+
+
+def test_retry_honours_retry_after(sleeps):
+    """A Retry-After header longer than the backoff delay sets the wait"""
+    calls = []
+    
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise _rate_limit_error(retry_after="7")
+        return "ok"
+    
+    assert retry_with_backoff(flaky, max_attempts=3, base=1.0) == "ok"
+    assert sleeps == [7.0]
+
+
+def test_retry_uses_exponential_backoff_without_header(sleeps):
+    """Without Retry-After the delay doubles per attempt"""
+    calls = []
+    
+    def flaky():
+        calls.append(1)
+        if len(calls) < 4:
+            raise _rate_limit_error()
+        return "ok"
+    
+    assert retry_with_backoff(flaky, max_attempts=5, base=1.0) == "ok"
+    assert sleeps == [1.0, 2.0, 4.0]
+
+
+def test_retry_reraises_after_max_attempts(sleeps):
+    """The last error propagates once all attempts are used up"""
+    calls = []
+    
+    def always_limited():
+        calls.append(1)
+        raise _rate_limit_error()
+    
+    with pytest.raises(openai.RateLimitError):
+        retry_with_backoff(always_limited, max_attempts=3, base=1.0)
+    assert len(calls) == 3
+    assert sleeps == [1.0, 2.0]
+
+
+def test_retry_does_not_retry_other_errors(sleeps):
+    """Errors other than rate limits and connection failures are raised immediately"""
+    def broken():
+        raise ValueError("bad input")
+    
+    with pytest.raises(ValueError):
+        retry_with_backoff(broken, max_attempts=5)
+    assert sleeps == []
+
+
+class _FailingEmbeddingClient:
+    """Stand-in LLMClient whose embedding requests all fail"""
+    
+    embedding_model = "text-embedding-3-small"
+    openai_client = object()
+    
+    def get_embeddings_batch(self, texts, raise_on_error=False):
+        raise ValueError("embeddings unavailable")
+    
+    def get_embedding(self, text):
+        return [0.0] * 1536  # Like LLMClient.get_embedding, which falls back to a mock vector
+
+
+def test_failed_requests_are_errors_not_mock_vectors(tmp_path, sleeps):
+    """When the batch and the per-ticket retries fail, tickets count as errors and nothing is checkpointed"""
+    generator = TicketEmbeddingGenerator(embeddings_file=str(tmp_path / "ticket_embeddings.json"))
+    generator.client = _FailingEmbeddingClient()
+    
+    result = generator.generate_embeddings()
+    
+    stats = result["metadata"]["processing_stats"]
+    assert stats["processed"] == 0
+    assert stats["errors"] == result["metadata"]["total_tickets"] > 0
+    assert result["embeddings"] == []
+    assert generator.checkpoint_file.read_text(encoding='utf-8') == ""
+
+
+class _MockEmbeddingClient:
+    """Stand-in LLMClient without an OpenAI client, returning mock vectors like LLMClient does"""
+    
+    embedding_model = "text-embedding-3-small"
+    openai_client = None
+    
+    def get_embeddings_batch(self, texts, raise_on_error=False):
+        return [[0.0] * 1536 for _ in texts]
+
+
+def test_mock_vectors_are_not_checkpointed(tmp_path):
+    """Vectors generated without an OpenAI client never reach the checkpoint"""
+    generator = TicketEmbeddingGenerator(embeddings_file=str(tmp_path / "ticket_embeddings.json"))
+    generator.client = _MockEmbeddingClient()
+    
+    result = generator.generate_embeddings()
+    
+    assert result["metadata"]["processing_stats"]["processed"] > 0
+    assert generator.load_checkpoint() == {}
+
+
+def test_fit_to_input_limit_without_tiktoken_keeps_content(tmp_path):
+    """Without an exact token count content is never cut; its byte count is the estimate"""
+    generator = TicketEmbeddingGenerator(embeddings_file=str(tmp_path / "ticket_embeddings.json"))
+    generator.encoding = None
+    content = "Pumpe fördert nicht " * 1000  # Far beyond MAX_INPUT_TOKENS bytes
+    
+    fitted, token_count = generator.fit_to_input_limit(content)
+    
+    assert fitted == content
+    assert token_count == len(content.encode('utf-8'))
+
+
+def _saved_generator(tmp_path):
+    """Generator whose embeddings file holds two saved records"""
+    generator = TicketEmbeddingGenerator(embeddings_file=str(tmp_path / "ticket_embeddings.json"))
+    records = [
+        generator.create_embedding_record(ticket_id, "content", ticket_id, vector, 1, "2024-01-01T00:00:00")
+        for ticket_id, vector in (("T-A", [1.0, 0.0]), ("T-B", [0.0, 1.0]))
+    ]
+    generator.save_embeddings({"metadata": {"model": "test", "dimension": 2}, "embeddings": records})
+    return generator
+
+
+def test_saved_vectors_load_back(tmp_path):
+    """Records saved with their .npy matrix get their own rows back"""
+    generator = _saved_generator(tmp_path)
+    
+    data = generator.load_existing_embeddings()
+    
+    assert data["metadata"]["vector_rows"] == 2
+    assert [record["ticket_id"] for record in data["embeddings"]] == ["T-A", "T-B"]
+    assert np.asarray(data["embeddings"][1]["embedding"]).tolist() == [0.0, 1.0]
+
+
+def test_mismatched_vectors_file_is_rejected(tmp_path):
+    """A .npy matrix replaced without its JSON file leads to a fresh start, not misattached rows"""
+    generator = _saved_generator(tmp_path)
+    np.save(generator.vectors_file, np.eye(2, dtype=np.float16)[::-1])  # Same shape, other rows
+    
+    data = generator.load_existing_embeddings()
+    
+    assert data["embeddings"] == []